@@ -0,0 +1,57 @@
+"""Benchmark the category pass of `load_catalog` on synthetic catalogs.
+
+Compares the vectorized `assign_categories` with the original row-by-row
+loop and checks both produce the same `קטגוריה` column. The loop skips the
+`כמות` and `קטגוריה` columns the loader fills in, as `assign_categories`
+now does, so blank separator rows do not start a category named '0'.
+
+    python benchmarks/bench_categories.py [rows ...]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from synthetic import raw_catalog_frame
+from panel_app.catalog_loader import assign_categories
+
+
+def legacy_categories(df):
+    df = df.copy()
+    df['קטגוריה'] = ''
+    current_category = ''
+    for idx in df.index:
+        if pd.isna(df.at[idx, 'מחיר יחידה']) or df.at[idx, 'מחיר יחידה'] == '':
+            for col in df.columns.drop(['כמות', 'קטגוריה']):
+                if pd.notna(df.at[idx, col]) and str(df.at[idx, col]).strip() != '':
+                    current_category = str(df.at[idx, col]).strip()
+                    break
+        else:
+            df.at[idx, 'קטגוריה'] = current_category
+    return df['קטגוריה']
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>8}")
+    for n in sizes:
+        df = raw_catalog_frame(n)
+        df.rename(columns={"מס'": 'מספר', 'תאור פריט': 'הפריט', 'סה"כ': 'סהכ'}, inplace=True)
+        df['כמות'] = 0
+        df['קטגוריה'] = ''
+        loop_s, expected = best_of(lambda: legacy_categories(df), repeat=1 if n > 10_000 else 3)
+        vec_s, actual = best_of(lambda: assign_categories(df))
+        assert actual.tolist() == expected.tolist(), 'category columns differ'
+        print(f"{n:>8} {loop_s:>10.4f} {vec_s:>15.4f} {loop_s / vec_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
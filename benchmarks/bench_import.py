@@ -0,0 +1,54 @@
+"""Measure cold import cost of the core modules with `python -X importtime`.
+
+Each module is imported in a fresh interpreter; the report shows the
+import time on top of interpreter startup, how many modules were loaded
+and whether Streamlit was pulled in (only the UI modules may do that).
+
+    python benchmarks/bench_import.py
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    'panel_app',
+    'panel_app.order_model',
+    'panel_app.catalog_loader',
+    'panel_app.catalog_index',
+    'panel_app.pdf_generator',
+    'panel_app.batch',
+    'panel_app.dashboard',
+]
+
+
+def import_profile(statement):
+    """Return [(depth, module, cumulative microseconds)] for running `statement`"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        entries.append((depth, name.strip(), int(cumulative)))
+    return entries
+
+
+def main():
+    startup = {name for _, name, _ in import_profile('pass')}
+    print(f"{'module':<26} {'import (ms)':>12} {'modules':>8} {'streamlit':>10}")
+    for module in MODULES:
+        entries = [e for e in import_profile(f'import {module}') if e[1] not in startup]
+        total = sum(us for depth, _, us in entries if depth == 0)
+        streamlit = any(name == 'streamlit' for _, name, _ in entries)
+        print(f"{module:<26} {total / 1000:>12.1f} {len(entries):>8} {'yes' if streamlit else 'no':>10}")
+
+
+if __name__ == '__main__':
+    main()
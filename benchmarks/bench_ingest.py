@@ -0,0 +1,57 @@
+"""Compare parse time and peak memory of the two catalog ingestion paths.
+
+`parse_catalog` goes through `pd.read_excel`; `stream_catalog` reads the
+sheet row by row (calamine when installed, otherwise openpyxl read-only).
+Each measurement runs in a fresh process so peak RSS includes memory held
+by native readers, which tracemalloc cannot see.
+
+    python benchmarks/bench_ingest.py [rows ...]
+"""
+import io
+import multiprocessing
+import resource
+import sys
+import time
+
+from synthetic import catalog_xlsx
+from panel_app import catalog_loader
+
+PATHS = {
+    'read_excel': catalog_loader.parse_catalog,
+    'streaming': catalog_loader.stream_catalog,
+}
+
+
+def _measure(name, data, queue):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    df = PATHS[name](io.BytesIO(data))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    queue.put((elapsed, peak * 1024, df))
+
+
+def measure(name, data):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(name, data, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'path':>10} {'time (s)':>10} {'peak RSS (MB)':>14}")
+    for n in sizes:
+        data = catalog_xlsx(n)
+        frames = []
+        for name in PATHS:
+            elapsed, peak, df = measure(name, data)
+            frames.append(df)
+            print(f"{n:>8} {name:>10} {elapsed:>10.3f} {peak / 2**20:>14.1f}")
+        assert frames[0].equals(frames[1]), 'catalogs differ'
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [10_000, 50_000])
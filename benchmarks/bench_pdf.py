@@ -0,0 +1,55 @@
+"""Benchmark per-quote PDF generation time.
+
+Renders a 1-page quote (items only), a 4-page quote (items, two renders
+and the terms page) and a paginated 300-row quote. The first rows start
+from an empty asset registry, as every call did before fonts and images
+were shared per process. The last row repeats the 4-page quote through
+the result cache, including the cost of hashing the inputs.
+
+    python benchmarks/bench_pdf.py [repeat]
+"""
+import sys
+import time
+
+from synthetic import customer, quote_items, render_image
+from panel_app import pdf_cache
+from panel_app.pdf_generator import create_enhanced_pdf
+from panel_app.utils import assets
+from panel_app.utils.rtl import rtl_cache_info
+
+
+def render_uncached(*args):
+    return create_enhanced_pdf(*args).getvalue()
+
+
+def run(label, repeat, cold, render=render_uncached, **kwargs):
+    timings, size = [], 0
+    for _ in range(repeat):
+        if cold:
+            assets.reset()
+        demos = {k: render_image(1600, 1200, seed=i) for i, k in enumerate(kwargs.get('demos', ()))}
+        start = time.perf_counter()
+        pdf = render(customer(), kwargs['items'], demos.get('demo1'), demos.get('demo2'))
+        timings.append(time.perf_counter() - start)
+        size = len(pdf)
+    timings.sort()
+    print(f"{label:<28} median {timings[len(timings) // 2] * 1000:8.1f}ms  size {size / 1024:8.1f}KB")
+
+
+def main(repeat):
+    items = quote_items(5)
+    for cold in (True, False):
+        state = 'cold registry' if cold else 'warm registry'
+        run(f"1 page, {state}", repeat, cold, items=items)
+        run(f"4 pages, {state}", repeat, cold, items=items, demos=('demo1', 'demo2'))
+    run("300 rows, paginated", repeat, False, items=quote_items(300))
+    run("4 pages, result cache", repeat, False, render=pdf_cache.render,
+        items=items, demos=('demo1', 'demo2'))
+    info = rtl_cache_info()
+    print(f"RTL shaping cache: {info['hits']} hits, {info['misses']} misses ({info['hit_rate']:.0%})")
+    info = pdf_cache.cache_info()
+    print(f"PDF result cache: {info['hits']} hits, {info['misses']} misses ({info['hit_rate']:.0%})")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
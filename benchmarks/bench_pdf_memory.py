@@ -0,0 +1,63 @@
+"""Benchmark peak Python memory per quote while rendering the PDF.
+
+For quotes of growing length (with two 12MP renders), compares the peak
+traced memory of `create_enhanced_pdf(...).getvalue()`
+- before: with ReportLab decoding each render to raw RGB to name it, as it
+          did before `PreparedImage`
+- after:  with the renders handed over as `PreparedImage`
+
+Peaks come from tracemalloc. The renders are prepared once before
+measuring (they are cached by `prepare_image`, which also bounds their
+size), so the peaks show what the document itself costs. ReportLab builds
+the whole document in memory and serializes it at save(), so where the
+bytes go afterwards (a BytesIO, a file) does not change the peak.
+
+    python benchmarks/bench_pdf_memory.py [rows ...]
+"""
+import sys
+import tracemalloc
+
+from reportlab.lib.utils import ImageReader
+
+from synthetic import customer, quote_items, render_image
+from panel_app.pdf_generator import create_enhanced_pdf
+from panel_app.utils.images import PreparedImage
+
+
+def to_bytes(args):
+    return len(create_enhanced_pdf(*args).getvalue())
+
+
+def decoded(args):
+    """Render with the renders decoded, as before `PreparedImage`"""
+    signature = PreparedImage.getRGBData
+    PreparedImage.getRGBData = ImageReader.getRGBData
+    try:
+        return to_bytes(args)
+    finally:
+        PreparedImage.getRGBData = signature
+
+
+def peak(func, args):
+    tracemalloc.start()
+    size = func(args)
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak_bytes, size
+
+
+def main(row_counts):
+    demos = [render_image(4000, 3000, seed=i).getvalue() for i in range(2)]
+    print(f"{'rows':>6} {'pdf size':>10} {'before':>10} {'after':>10}")
+    for rows in row_counts:
+        args = (customer(), quote_items(rows), *demos)
+        to_bytes(args)
+        peaks = []
+        for func in (decoded, to_bytes):
+            peak_bytes, size = peak(func, args)
+            peaks.append(peak_bytes)
+        print(f"{rows:>6} {size / 2 ** 20:>8.1f}MB " + ' '.join(f"{p / 2 ** 20:>8.1f}MB" for p in peaks))
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [20, 300, 3000])
@@ -0,0 +1,79 @@
+"""Benchmark the pricing engine on large orders and bulk repricing.
+
+Prices a 100k-line order through `pricing` and through the per-line float
+loop the dashboard used, then reprices many saved quotes at once (e.g.
+after a VAT change) with one `bulk_totals` call against one
+`order_totals` call per quote.
+
+    python benchmarks/bench_pricing.py [lines] [quotes]
+"""
+import sys
+import time
+from decimal import Decimal
+
+import numpy as np
+
+import synthetic  # noqa: F401  (puts the repository on sys.path)
+from panel_app import pricing
+
+
+def timed(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+def legacy_totals(prices, quantities, discount_pct, contractor_discount):
+    subtotal = 0.0
+    for price, qty in zip(prices, quantities):
+        subtotal += qty * price
+    sub_after = subtotal - contractor_discount
+    vat = sub_after * 0.17
+    discount = (sub_after + vat) * (discount_pct / 100)
+    return sub_after + vat - discount
+
+
+def main(n_lines, n_quotes):
+    rng = np.random.default_rng(0)
+    prices = rng.integers(1, 2_000_000, n_lines) / 100
+    quantities = rng.integers(1, 20, n_lines)
+
+    seconds, legacy = timed(lambda: legacy_totals(prices.tolist(), quantities.tolist(), 7.5, 1000.0))
+    print(f"{n_lines:,} lines, float loop     {seconds * 1000:8.1f}ms  total ₪{legacy:,.2f}")
+    seconds, totals = timed(lambda: pricing.order_totals(
+        pricing.line_totals(prices, quantities), 7.5, 1000.0))
+    print(f"{n_lines:,} lines, pricing        {seconds * 1000:8.1f}ms  total ₪{totals['total'] / 100:,.2f}")
+
+    lines_per_quote = 20
+    quote_ids = np.repeat(np.arange(n_quotes), lines_per_quote)
+    lines = pricing.line_totals(
+        rng.integers(1, 2_000_000, len(quote_ids)) / 100,
+        rng.integers(1, 10, len(quote_ids)),
+    )
+    discounts = rng.integers(0, 20, n_quotes).astype(float)
+    contractor = rng.integers(0, 50, n_quotes) * 100.0
+    new_vat = Decimal('0.18')
+
+    def one_by_one():
+        bounds = np.arange(0, len(lines) + 1, lines_per_quote)
+        return [
+            pricing.order_totals(lines[start:stop], discounts[q], contractor[q], new_vat)['total']
+            for q, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+
+    seconds, looped = timed(one_by_one, repeat=1)
+    print(f"reprice {n_quotes:,} quotes, one by one {seconds * 1000:8.1f}ms")
+    seconds, bulk = timed(lambda: pricing.bulk_totals(quote_ids, lines, discounts, contractor, new_vat))
+    print(f"reprice {n_quotes:,} quotes, bulk       {seconds * 1000:8.1f}ms")
+    assert bulk['total'].tolist() == looped
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+    )
@@ -0,0 +1,73 @@
+"""Benchmark the saved-quote store with many quotes.
+
+Fills a fresh database with synthetic quotes (in one transaction), then
+times name, phone and date lookups, deep pagination, loading one quote and
+re-rendering its PDF.
+
+    python benchmarks/bench_quote_store.py [quotes]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from synthetic import WORDS, customer, quote_items
+from panel_app.quote_store import QuoteStore
+
+FIRST_NAMES = ['דנה', 'יוסי', 'מיכל', 'אבי', 'נועה', 'רון', 'שירה', 'עומר', 'טל', 'גיל']
+
+
+def synthetic_quotes(n, seed=0):
+    rnd = random.Random(seed)
+    items = [quote_items(k) for k in (3, 8, 15)]
+    start = date(2024, 1, 1)
+    for i in range(n):
+        data = customer()
+        data['name'] = f"{rnd.choice(FIRST_NAMES)} {rnd.choice(WORDS)} {i}"
+        data['phone'] = f"05{rnd.randint(0, 9)}-{rnd.randint(1000000, 9999999)}"
+        data['date'] = start + timedelta(days=rnd.randint(0, 700))
+        yield data, rnd.choice(items), None, None
+
+
+def timed(func, repeat=50):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, timings[int(len(timings) * 0.95)] * 1000, result
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = QuoteStore(os.path.join(tmp, 'quotes.sqlite3'))
+        start = time.perf_counter()
+        for chunk_start in range(0, n, 10_000):
+            store.save_many(synthetic_quotes(min(10_000, n - chunk_start), seed=chunk_start))
+        fill = time.perf_counter() - start
+        size = os.path.getsize(store.path) + os.path.getsize(store.path + '-wal')
+        print(f"{len(store):,} quotes saved in {fill:.1f}s, database {size / 1024 / 1024:.1f}MB "
+              f"({size / n:.0f} bytes/quote)")
+
+        cases = [
+            ('name prefix', lambda: store.search('דנה ארו')),
+            ('phone prefix', lambda: store.search('052-12')),
+            ('date', lambda: store.search('2024-06-01')),
+            ('all, page 1', lambda: store.search()),
+            ('all, page 2000', lambda: store.search(page=2000)),
+            ('load quote', lambda: store.get(n // 2)),
+        ]
+        for label, func in cases:
+            p50, p95, result = timed(func)
+            matches = f"{result[1]:,} matches" if isinstance(result, tuple) else ''
+            print(f"{label:<16} p50 {p50:7.2f}ms  p95 {p95:7.2f}ms  {matches}")
+
+        p50, p95, _ = timed(lambda: store.render_pdf(n // 3), repeat=5)
+        print(f"{'re-render PDF':<16} p50 {p50:7.2f}ms  (first render, then served from the PDF cache)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,75 @@
+"""Benchmark reloading an updated price list against the previous version.
+
+Builds a catalog, then a new version of it with a few hundred price
+changes, renamed, added and removed items, and compares building the
+search index from scratch with `CatalogDiff` plus `CatalogIndex.updated`.
+Both indexes are checked to match. Parsing the new Excel is not included;
+it is the same for both paths.
+
+    python benchmarks/bench_reload.py [rows] [price changes]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic import raw_catalog_frame
+from panel_app.catalog_diff import CatalogDiff
+from panel_app.catalog_index import CatalogIndex
+from panel_app.catalog_loader import _finish_catalog, _normalize_columns, assign_categories
+
+
+def finish(raw):
+    df = raw.copy()
+    df.columns = _normalize_columns(df.columns)
+    df['קטגוריה'] = assign_categories(df)
+    return _finish_catalog(df)
+
+
+def new_version(raw, n_repriced, seed=1):
+    rng = np.random.default_rng(seed)
+    raw = raw.copy()
+    priced = np.flatnonzero(raw['מחיר יחידה'].notna().to_numpy())
+    rows = raw.index[rng.choice(priced, n_repriced + 80, replace=False)]
+    raw.loc[rows[:n_repriced], 'מחיר יחידה'] += 25
+    raw.loc[rows[n_repriced:n_repriced + 30], 'תאור פריט'] = [f'דגם חדש {i}' for i in range(30)]
+    raw = raw.drop(rows[n_repriced + 30:])
+    added = raw.iloc[:50].copy()
+    added["מס'"] = np.arange(900_000, 900_000 + len(added))
+    return pd.concat([raw, added], ignore_index=True)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main(n_rows, n_repriced):
+    raw = raw_catalog_frame(n_rows)
+    old_df = finish(raw)
+    new_df = finish(new_version(raw, n_repriced))
+    old_index = CatalogIndex(old_df)
+
+    full_seconds, full = timed(lambda: CatalogIndex(new_df))
+    diff_seconds, diff = timed(lambda: CatalogDiff(old_df, new_df))
+    update_seconds, updated = timed(lambda: old_index.updated(old_df, new_df, diff))
+
+    assert full.vocabulary == updated.vocabulary
+    for i in range(len(full.vocabulary)):
+        a = full.postings[full.offsets[i]:full.offsets[i + 1]]
+        b = updated.postings[updated.offsets[i]:updated.offsets[i + 1]]
+        assert np.array_equal(np.sort(a), np.sort(b)), full.vocabulary[i]
+
+    print(f"rows: {len(new_df):,}  changes: {diff.summary()}")
+    print(f"full index build          {full_seconds * 1000:8.1f}ms")
+    print(f"diff + incremental update {(diff_seconds + update_seconds) * 1000:8.1f}ms"
+          f"  (diff {diff_seconds * 1000:.1f}ms, index {update_seconds * 1000:.1f}ms)")
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
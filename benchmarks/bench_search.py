@@ -0,0 +1,41 @@
+"""Benchmark building the catalog index and type-ahead search latency.
+
+    python benchmarks/bench_search.py [rows]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+from synthetic import WORDS, raw_catalog_frame
+from panel_app.catalog_index import CatalogIndex
+
+
+def main(n):
+    df = raw_catalog_frame(n).rename(columns={'תאור פריט': 'הפריט'})
+    df['הערות'] = df['הערות'].fillna('')
+    df['קטגוריה'] = [f'קטגוריה {i // 50}' for i in range(len(df))]
+
+    start = time.perf_counter()
+    index = CatalogIndex(df)
+    print(f"rows: {n:,}  build: {time.perf_counter() - start:.3f}s  vocabulary: {len(index.vocabulary):,}")
+
+    rnd = random.Random(0)
+    queries = []
+    for _ in range(500):
+        words = [rnd.choice(WORDS) for _ in range(rnd.randint(1, 3))]
+        words[-1] = words[-1][:rnd.randint(1, len(words[-1]))]
+        queries.append(' '.join(words))
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p95, worst = np.percentile(timings, [50, 95, 100])
+    print(f"search over {len(queries)} typed prefixes: p50 {p50:.2f}ms  p95 {p95:.2f}ms  max {worst:.2f}ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
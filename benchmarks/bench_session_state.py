@@ -0,0 +1,103 @@
+"""Report the memory one open dashboard session holds, before and after
+compacting the session state.
+
+Before: each session kept its `selected_items` frame (every catalog column
+of the chosen rows) and both renders as uploaded files, and every rerun
+got its own unpickled copy of the catalog from `st.cache_data`.
+After: a session keeps its sparse `Order` (item key -> quantity and price)
+and the digests of its renders; the catalog and the render bytes are held
+once per process (`load_catalog` resource, `blob_store`).
+
+Sizes are measured with tracemalloc over `sessions` sessions that all
+upload the same two renders, as happens when a team quotes one project.
+
+    python benchmarks/bench_session_state.py [sessions] [catalog rows] [items per quote]
+"""
+import io
+import pickle
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from synthetic import catalog_xlsx, render_image
+from panel_app import blob_store
+from panel_app.catalog_loader import load_catalog_file
+from panel_app.order_model import Order
+
+
+def build_order(catalog_df, n_items, seed):
+    rnd = random.Random(seed)
+    order = Order()
+    for key in rnd.sample(list(catalog_df.index), n_items):
+        order.set_quantity(key, rnd.randint(1, 5), catalog_df.at[key, 'מחיר יחידה'])
+    return order
+
+
+def uploaded(data):
+    """A BytesIO over its own copy of the upload, like an `UploadedFile`"""
+    f = io.BytesIO()
+    f.write(data)
+    return f
+
+
+def before_state(catalog_df, order, renders):
+    return {
+        'order': order,
+        'selected_items': order.items_frame(catalog_df),
+        'demo1': uploaded(renders[0]),
+        'demo2': uploaded(renders[1]),
+    }
+
+
+def after_state(order, renders, blob_dir):
+    return {
+        'order': order,
+        'opened_quote': None,
+        'demo1': blob_store.put(renders[0], blob_dir=blob_dir),
+        'demo2': blob_store.put(renders[1], blob_dir=blob_dir),
+        'upload_ids': {'demo1': 'upload-1', 'demo2': 'upload-2'},
+    }
+
+
+def traced(func):
+    """Return (result, net bytes allocated by func) as seen by tracemalloc"""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = func()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return result, size
+
+
+def main(n_sessions, n_rows, n_items):
+    catalog_df = load_catalog_file(io.BytesIO(catalog_xlsx(n_rows)))
+    renders = [render_image(2000, 1500, seed=i).getvalue() for i in range(2)]
+    orders = [build_order(catalog_df, n_items, seed) for seed in range(n_sessions)]
+    orders_size = traced(lambda: [build_order(catalog_df, n_items, seed) for seed in range(n_sessions)])[1]
+
+    _, before = traced(lambda: [before_state(catalog_df, order, renders) for order in orders])
+    _, catalog_copy = traced(lambda: pickle.loads(pickle.dumps(catalog_df)))
+    with tempfile.TemporaryDirectory() as blob_dir:
+        _, after = traced(lambda: [after_state(order, renders, blob_dir) for order in orders])
+
+    shared = sum(len(r) for r in renders)
+    print(f"{n_sessions} sessions, {len(catalog_df):,}-row catalog, {n_items} items per quote, "
+          f"renders {shared / 1024:.0f}KB per quote")
+    print(f"{'':<36}{'per session':>14}{'total':>12}")
+    for label, size in [
+        ('before: order + frame + uploads', before + orders_size),
+        ('after: order + digests', after + orders_size),
+    ]:
+        print(f"{label:<36}{size / n_sessions / 1024:>12.1f}KB{size / 1024 / 1024:>10.1f}MB")
+    print(f"{'after: renders held once (shared)':<36}{'':>14}{shared / 1024 / 1024:>10.1f}MB")
+    print(f"{'before: catalog copy per rerun':<36}{catalog_copy / 1024:>12.1f}KB"
+          f"  (now one shared frame per catalog)")
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20_000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 20,
+    )
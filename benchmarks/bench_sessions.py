@@ -0,0 +1,242 @@
+"""Load test: concurrent salespeople working the dashboard through AppTest.
+
+Every simulated session runs `panel_app/app.py` headless (no browser, no
+network): it fills in the customer, uploads a synthetic catalog, selects
+items, creates the quote and waits for its PDF. Sessions run on a thread
+pool, `concurrency` at a time, against one shared process, as they would
+on one Streamlit server. AppTest swaps a process-wide runtime on every
+run, so script runs take turns (as they mostly do behind the GIL of one
+server process); the PDF jobs they queue overlap in the worker pool. A
+rerun's latency includes waiting for its turn, as the user would see it.
+
+Reports p50/p95 rerun latency (per step), time from "create" to a
+downloadable PDF, RSS growth per open session and quotes per second. The
+results are written as JSON; pass an earlier results file to print the
+change per metric.
+
+    python benchmarks/bench_sessions.py [--sessions 20] [--concurrency 4]
+        [--rows 5000] [--items 15] [--out results.json] [--compare old.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from synthetic import ROOT, catalog_xlsx
+
+# keep the saved quotes and caches of the run out of the working tree
+_TMP = tempfile.mkdtemp(prefix='panel-bench-')
+os.environ.setdefault('PANEL_DATA_DIR', os.path.join(_TMP, 'data'))
+os.environ.setdefault('PANEL_CACHE_DIR', os.path.join(_TMP, 'cache'))
+
+import streamlit  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from panel_app import pdf_jobs  # noqa: E402
+from panel_app.catalog_loader import load_catalog_file  # noqa: E402
+
+APP = os.path.join(ROOT, 'panel_app', 'app.py')
+STEPS = ['open', 'customer', 'upload', 'select', 'create', 'download']
+PDF_TIMEOUT = 120
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+_run_lock = threading.Lock()
+
+
+def rss_bytes():
+    """Current resident set size of this process (peak RSS where /proc is missing)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class Session:
+    """One salesperson: a scripted AppTest run with timings per step"""
+
+    def __init__(self, number, catalog, catalog_df, n_items):
+        self.number = number
+        self.catalog = catalog
+        self.catalog_df = catalog_df
+        self.n_items = n_items
+        self.timings = {step: [] for step in STEPS}
+        self.pdf_seconds = None
+        self.error = None
+        self.at = None
+
+    def _run(self, step):
+        start = time.perf_counter()
+        with _run_lock:
+            self.at.run()
+        self.timings[step].append(time.perf_counter() - start)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].value)
+
+    def _button(self, text):
+        return next(b for b in self.at.button if text in b.label)
+
+    def __call__(self):
+        try:
+            self.script()
+        except Exception as e:
+            self.error = f'{type(e).__name__}: {e}'
+        return self
+
+    def script(self):
+        rnd = random.Random(self.number)
+        with _run_lock:
+            self.at = AppTest.from_file(APP, default_timeout=PDF_TIMEOUT)
+        self._run('open')
+
+        self.at.text_input[0].set_value(f'לקוח בדיקה {self.number}')
+        self.at.text_input[1].set_value(f'05{rnd.randint(0, 9)}-{rnd.randint(1000000, 9999999)}')
+        self._run('customer')
+
+        self.at.file_uploader[0].upload('catalog.xlsx', self.catalog, XLSX_MIME)
+        self._run('upload')
+
+        # the quantity table is a data editor, which AppTest cannot edit;
+        # set the quantities on the session order as the editor would
+        order = self.at.session_state.order
+        priced = self.catalog_df[self.catalog_df['מחיר יחידה'] > 0]
+        for key in rnd.sample(list(priced.index), min(self.n_items, len(priced))):
+            order.set_quantity(key, rnd.randint(1, 5), priced.at[key, 'מחיר יחידה'])
+        self._run('select')
+
+        self._button('צור הצעת מחיר').click()
+        start = time.perf_counter()
+        self._run('create')
+        job_id = self.at.session_state.pdf_job
+        if not job_id:
+            raise RuntimeError('the PDF job was not queued')
+        while True:
+            job = pdf_jobs.get(job_id)
+            if job is None or job.done:
+                break
+            if time.perf_counter() - start > PDF_TIMEOUT:
+                raise TimeoutError(f'PDF not ready after {PDF_TIMEOUT}s')
+            time.sleep(0.01)
+        self._run('download')
+        if not any('הורד' in b.label for b in self.at.get('download_button')):
+            raise RuntimeError(job.error if job is not None else 'the PDF job was discarded')
+        self.pdf_seconds = time.perf_counter() - start
+
+
+def git_version():
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(n_sessions, concurrency, n_rows, n_items):
+    catalog = catalog_xlsx(n_rows)
+    catalog_df = load_catalog_file(io.BytesIO(catalog))
+    # one warm-up session so imports and the first catalog parse are not
+    # charged to the measured sessions
+    warmup = Session(-1, catalog, catalog_df, n_items)()
+    if warmup.error:
+        raise SystemExit(f'warm-up session failed: {warmup.error}')
+
+    rss_before = rss_bytes()
+    sessions = [Session(i, catalog, catalog_df, n_items) for i in range(n_sessions)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        finished = list(pool.map(lambda session: session(), sessions))
+    wall = time.perf_counter() - start
+    # the sessions (and their state) are still referenced here, like open tabs
+    rss_after = rss_bytes()
+
+    ok = [s for s in finished if s.error is None]
+    steps = {}
+    for step in STEPS:
+        values = [t for s in ok for t in s.timings[step]]
+        steps[step] = {'p50_ms': _ms(percentile(values, 0.5)), 'p95_ms': _ms(percentile(values, 0.95))}
+    reruns = [t for s in ok for step in STEPS for t in s.timings[step]]
+    pdf = [s.pdf_seconds for s in ok]
+    return {
+        'sessions': n_sessions,
+        'completed': len(ok),
+        'errors': sorted({s.error for s in finished if s.error}),
+        'wall_seconds': round(wall, 3),
+        'quotes_per_second': round(len(ok) / wall, 3) if wall else None,
+        'reruns_per_second': round(len(reruns) / wall, 3) if wall else None,
+        'rerun_p50_ms': _ms(percentile(reruns, 0.5)),
+        'rerun_p95_ms': _ms(percentile(reruns, 0.95)),
+        'pdf_p50_ms': _ms(percentile(pdf, 0.5)),
+        'pdf_p95_ms': _ms(percentile(pdf, 0.95)),
+        'rss_before_mb': round(rss_before / 2 ** 20, 1),
+        'rss_after_mb': round(rss_after / 2 ** 20, 1),
+        'rss_per_session_kb': round((rss_after - rss_before) / max(1, n_sessions) / 1024, 1),
+        'steps': steps,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def compare(results, previous):
+    """Print the change of every numeric top-level metric against an earlier run"""
+    print(f"\nchange against {previous.get('version') or 'previous run'} ({previous.get('timestamp')}):")
+    for key, value in results['results'].items():
+        old = previous.get('results', {}).get(key)
+        if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            print(f"  {key:<22} {old:>10} -> {value:<10} {(value / old - 1) * 100:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=5000, help='catalog rows')
+    parser.add_argument('--items', type=int, default=15, help='items per quote')
+    parser.add_argument('--out', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='an earlier results file to compare with')
+    args = parser.parse_args()
+
+    results = {
+        'version': git_version(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'cpus': os.cpu_count(),
+        'params': {
+            'sessions': args.sessions, 'concurrency': args.concurrency,
+            'rows': args.rows, 'items': args.items, 'pdf_workers': pdf_jobs.MAX_WORKERS,
+        },
+        'results': run(args.sessions, args.concurrency, args.rows, args.items),
+    }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+    pdf_jobs.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Measure what one catalog costs per worker process.
+
+Prints the in-memory size of a catalog in the old layout (object text,
+float64 quantity and line total columns) and in the compact dtypes, then
+starts `workers` processes that each open the catalog from the cache and
+touch every column, all holding it at the same time:
+
+- mapped: the Arrow entry `catalog_cache.get` opens memory-mapped
+- heap:   the same catalog read from Parquet into each process's heap
+
+For each, reports the growth in private memory per process and the
+proportional set size (PSS, shared pages divided among the processes that
+map them) from /proc/self/smaps_rollup, so Linux only. What stays private
+in the mapped case is mostly the hash table pandas builds over the item
+keys for lookups, which every process needs.
+
+    python benchmarks/bench_shared_catalog.py [rows] [workers]
+"""
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from synthetic import raw_catalog_frame
+from panel_app import catalog_cache
+from panel_app.catalog_loader import _finish_catalog, _normalize_columns, assign_categories
+
+
+def memory():
+    """(private, pss) bytes of this process"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    return values['Private_Clean'] + values['Private_Dirty'], values['Pss']
+
+
+def touch(df):
+    """Read every value, as searching and pricing the catalog eventually does"""
+    total = df['מחיר יחידה'].sum() + df['כמות'].sum()
+    for col in ('הפריט', 'הערות'):
+        total += df[col].str.len().sum()
+    return total + df['קטגוריה'].cat.codes.sum() + len(df.index)
+
+
+def load(mode, cache_dir, digest):
+    if mode == 'mapped':
+        return catalog_cache.get(digest, cache_dir)
+    return pd.read_parquet(os.path.join(cache_dir, f'{digest}.parquet'))
+
+
+def worker(mode, cache_dir, barrier, results):
+    # read a small catalog first so imports and one-time setup are not counted
+    touch(load(mode, cache_dir, 'warmup'))
+    before = memory()
+    touch(load(mode, cache_dir, 'catalog'))
+    barrier.wait()
+    after = memory()
+    results.put((after[0] - before[0], after[1] - before[1]))
+    barrier.wait()
+
+
+def legacy_layout(df):
+    df = df.copy()
+    for col in ('הפריט', 'הערות', 'קטגוריה'):
+        df[col] = df[col].astype(object)
+    df['כמות'] = df['כמות'].astype('float64')
+    df['סהכ'] = float('nan')
+    return df
+
+
+def run_workers(mode, cache_dir, n_workers):
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, cache_dir, barrier, results)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    values = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    private = sum(v[0] for v in values) / n_workers
+    pss = sum(v[1] for v in values) / n_workers
+    print(f"{mode:<8} private {private / 2 ** 20:7.1f}MB/process   PSS {pss / 2 ** 20:7.1f}MB/process"
+          f"   host total {pss * n_workers / 2 ** 20:7.1f}MB")
+
+
+def main(n_rows, n_workers):
+    raw = raw_catalog_frame(n_rows)
+    raw.columns = _normalize_columns(raw.columns)
+    raw['קטגוריה'] = assign_categories(raw)
+    df = _finish_catalog(raw)
+    old_size = legacy_layout(df).memory_usage(deep=True).sum()
+    new_size = df.memory_usage(deep=True).sum()
+    print(f"{len(df):,} rows: old layout {old_size / 2 ** 20:.1f}MB, compact dtypes {new_size / 2 ** 20:.1f}MB")
+    print(df.dtypes.to_string())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for digest, frame in (('warmup', df.head(100)), ('catalog', df)):
+            catalog_cache.put(digest, frame, cache_dir)
+            frame.to_parquet(os.path.join(cache_dir, f'{digest}.parquet'))
+        print(f"\n{n_workers} worker processes holding the catalog at once:")
+        run_workers('mapped', cache_dir, n_workers)
+        run_workers('heap', cache_dir, n_workers)
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+    )
@@ -0,0 +1,100 @@
+"""Synthetic supplier catalogs and quotes for the benchmark scripts."""
+import io
+import os
+import random
+import sys
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+HEADER = ["מס'", 'תאור פריט', 'הערות', 'כמות', 'מחיר יחידה', 'סה"כ']
+WORDS = ['ארון', 'מגירה', 'דלת', 'משטח', 'קוורץ', 'פורמייקה', 'ידית', 'ציר',
+         'מדף', 'כיור', 'ברז', 'תאורה', 'לבן', 'אגוז', 'אלון', 'מט', 'מבריק']
+
+
+def catalog_rows(n_rows, n_categories=None, seed=0):
+    """Return raw sheet rows (header row first) as they appear in a price list"""
+    rnd = random.Random(seed)
+    n_categories = n_categories or max(1, n_rows // 50)
+    per_category = max(1, n_rows // n_categories)
+    rows = [HEADER]
+    number = 1000
+    for c in range(n_categories):
+        rows.append([None, f'קטגוריה {c} {rnd.choice(WORDS)}', None, None, None, None])
+        for i in range(per_category):
+            if i == per_category // 2:
+                # price lists often have blank separator rows inside a category
+                rows.append([None] * len(HEADER))
+            number += 1
+            name = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 6)))
+            notes = rnd.choice(['', 'לפי מידה', f'{rnd.randint(40, 120)} ס"מ'])
+            price = rnd.choice([0, round(rnd.uniform(50, 5000), 2)])
+            rows.append([number, name, notes or None, None, price, None])
+    return rows
+
+
+def catalog_xlsx(n_rows, n_categories=None, seed=0):
+    """Return the bytes of a synthetic catalog workbook"""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('גיליון1')
+    for i in range(8):
+        ws.append(['Panel Kitchens' if i == 0 else None])
+    for row in catalog_rows(n_rows, n_categories, seed):
+        ws.append(row)
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def raw_catalog_frame(n_rows, n_categories=None, seed=0):
+    """Return the frame `pd.read_excel(..., header=8)` would produce for a catalog"""
+    rows = catalog_rows(n_rows, n_categories, seed)
+    return pd.DataFrame(rows[1:], columns=rows[0])
+
+
+def customer(name='ישראל ישראלי'):
+    return {
+        'name': name,
+        'phone': '050-1234567',
+        'email': 'name@example.com',
+        'address': 'הנגרים 1, באר שבע',
+        'date': date(2025, 1, 1),
+        'discount': 5.0,
+        'contractor': False,
+        'contractor_discount': 0.0,
+    }
+
+
+def quote_items(n_items, seed=0):
+    """Return a `selected_items` frame as the dashboard passes it to the PDF"""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n_items):
+        qty = rnd.randint(1, 5)
+        price = round(rnd.uniform(50, 5000), 2)
+        name = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 12)))
+        rows.append({'מספר': 1000 + i, 'הפריט': name, 'הערות': '', 'כמות': qty,
+                     'מחיר יחידה': price, 'סהכ': qty * price, 'קטגוריה': 'קטגוריה'})
+    return pd.DataFrame(rows)
+
+
+def render_image(width=4000, height=3000, seed=0, fmt='JPEG'):
+    """Return an in-memory photo-sized image like a phone render upload"""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([(x * 255 // width), (y * 255 // height), ((x + y) * 127 // (width + height))], axis=-1)
+    noise = rng.integers(0, 40, size=(height, width, 3))
+    img = Image.fromarray((base + noise).clip(0, 255).astype('uint8'))
+    out = io.BytesIO()
+    img.save(out, format=fmt, quality=92)
+    out.seek(0)
+    return out
@@ -0,0 +1,26 @@
+"""Panel Kitchens quotes: catalog parsing, pricing and PDF generation.
+
+The core modules do not import Streamlit; the UI lives in `app`,
+`dashboard` and `streamlit_adapter`. The names below are imported from
+their submodules on first access, so `import panel_app` stays cheap.
+"""
+import importlib
+
+_EXPORTS = {
+    'load_catalog_file': 'catalog_loader',
+    'parse_catalog': 'catalog_loader',
+    'stream_catalog': 'catalog_loader',
+    'CatalogIndex': 'catalog_index',
+    'Order': 'order_model',
+    'create_enhanced_pdf': 'pdf_generator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
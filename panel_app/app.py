@@ -1,8 +1,15 @@
 # file: panel_app/app.py
 import os
+import sys
+
 import streamlit as st
 
-from dashboard import render_dashboard
+# `streamlit run panel_app/app.py` executes this file as a script, so make
+# the package importable from its parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from panel_app import perf  # noqa: E402
+from panel_app.dashboard import render_dashboard  # noqa: E402
 
 st.set_page_config(
     page_title="Panel Kitchens - הצעות מחיר",
@@ -15,4 +22,5 @@ css_file = os.path.join(os.path.dirname(__file__), 'static', 'custom.css')
 with open(css_file, encoding='utf-8') as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
+perf.serve_metrics()
 render_dashboard()
@@ -0,0 +1,190 @@
+# file: panel_app/batch.py
+"""Generate quotes in bulk without the Streamlit UI.
+
+    python -m panel_app.batch catalog.xlsx orders.jsonl --out quotes.zip
+
+Orders are read from JSONL or CSV, one quote per record:
+
+    {"name": "...", "phone": "...", "email": "...", "address": "...",
+     "date": "2025-01-31", "discount": 5, "contractor_discount": 0,
+     "items": {"1001": 2, "1002": 1}, "demo1": "render.jpg"}
+
+In CSV the same fields are columns and `items` is written as
+`1001:2;1002:1`. Items are matched by the catalog number (`מספר`), or by
+the item key for rows without one. Quotes are rendered on a process pool
+and written to a directory or, when `--out` ends with `.zip`, streamed
+into a zip archive. Workers write each PDF to a file (for a zip, a
+staging file next to it that is copied into its entry), so PDFs are never
+passed between processes in memory.
+
+A quote that fails (a bad date or quantity, a missing render) is reported
+on stderr with its sequence number and the run goes on; the exit status is
+1 if any quote failed.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+from .catalog_loader import item_number, load_catalog_file
+from .order_model import Order
+from .pdf_generator import create_enhanced_pdf
+
+_catalog = None
+
+
+def parse_items(value):
+    """Parse `{"1001": 2}` or `1001:2;1002:1` into {number: qty}"""
+    if isinstance(value, dict):
+        return {item_number(k): int(v) for k, v in value.items()}
+    items = {}
+    for part in str(value or '').split(';'):
+        if part.strip():
+            number, _, qty = part.partition(':')
+            items[item_number(number)] = int(qty or 1)
+    return items
+
+
+def read_orders(path):
+    """Yield order records from a JSONL or CSV file.
+
+    Relative image paths are resolved against the directory of the file.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith('.csv'):
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for order in records:
+            for key in ('demo1', 'demo2'):
+                if order.get(key):
+                    order[key] = os.path.join(base, order[key])
+            yield order
+
+
+def customer_data(order):
+    return {
+        'name': order.get('name', ''),
+        'phone': order.get('phone', ''),
+        'email': order.get('email', ''),
+        'address': order.get('address', ''),
+        'date': date.fromisoformat(order['date']) if order.get('date') else date.today(),
+        'discount': float(order.get('discount') or 0),
+        'contractor': bool(float(order.get('contractor_discount') or 0)),
+        'contractor_discount': float(order.get('contractor_discount') or 0),
+    }
+
+
+def quote_filename(seq, customer):
+    name = f"הצעת_מחיר_{customer['name']}_{customer['email']}_{customer['date']}"
+    name = re.sub(r'[\\/:*?"<>|]+', '_', name)
+    return f"{seq:05d}_{name}.pdf"
+
+
+def _init_worker(catalog_path):
+    global _catalog
+    _catalog = load_catalog_file(catalog_path)
+
+
+def render_quote(seq, order, out_dir):
+    """Render one order into `out_dir`; return (seq, filename, seconds, missing item numbers)"""
+    start = time.perf_counter()
+    customer = customer_data(order)
+    quote = Order()
+    missing = []
+    for number, qty in parse_items(order.get('items')).items():
+        # catalog rows are keyed by their number (see catalog_loader.item_keys)
+        if number not in _catalog.index:
+            missing.append(number)
+        elif qty > 0:
+            quote.set_quantity(number, qty, _catalog.at[number, 'מחיר יחידה'])
+    filename = quote_filename(seq, customer)
+    path = os.path.join(out_dir, filename)
+    pdf = create_enhanced_pdf(
+        customer,
+        quote.items_frame(_catalog),
+        order.get('demo1') or None,
+        order.get('demo2') or None,
+    )
+    try:
+        with open(path, 'wb') as f:
+            f.write(pdf.getbuffer())
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return seq, filename, time.perf_counter() - start, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('catalog', help='supplier price list (.xlsx)')
+    parser.add_argument('orders', help='orders file (.jsonl or .csv)')
+    parser.add_argument('--out', default='quotes', help='output directory, or a .zip file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    args = parser.parse_args(argv)
+
+    # parse once here so the workers load the catalog from the disk cache
+    load_catalog_file(args.catalog)
+    orders = list(read_orders(args.orders))
+
+    archive = None
+    out_dir = args.out
+    if args.out.lower().endswith('.zip'):
+        archive = zipfile.ZipFile(args.out, 'w', zipfile.ZIP_STORED)
+        out_dir = tempfile.mkdtemp(prefix='.quotes-', dir=os.path.dirname(os.path.abspath(args.out)))
+    else:
+        os.makedirs(args.out, exist_ok=True)
+
+    latencies = []
+    failed = 0
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args.catalog,)) as pool:
+            futures = {
+                pool.submit(render_quote, seq, order, out_dir): seq for seq, order in enumerate(orders, start=1)
+            }
+            for future in as_completed(futures):
+                try:
+                    seq, filename, seconds, missing = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"quote {futures[future]}: failed: {type(e).__name__}: {e}", file=sys.stderr)
+                    continue
+                latencies.append(seconds)
+                if missing:
+                    print(f"quote {seq}: unknown catalog numbers {', '.join(missing)}", file=sys.stderr)
+                if archive is not None:
+                    staged = os.path.join(out_dir, filename)
+                    with open(staged, 'rb') as src, archive.open(filename, 'w') as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(staged)
+    finally:
+        if archive is not None:
+            archive.close()
+            shutil.rmtree(out_dir, ignore_errors=True)
+    elapsed = time.perf_counter() - start
+
+    if latencies:
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{len(latencies)} quotes in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} quotes/sec), "
+              f"latency p50 {p50 * 1000:.0f}ms p95 {p95 * 1000:.0f}ms")
+    if failed:
+        print(f"{failed} of {len(orders)} quotes failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
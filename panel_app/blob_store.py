@@ -0,0 +1,62 @@
+# file: panel_app/blob_store.py
+"""Uploaded renders shared by every session of the process.
+
+Sessions keep only the SHA-256 of an upload (`put` returns it) and fetch
+the bytes with `get` when a PDF is drawn, so a render is held once however
+many sessions or reopened saved quotes use it, instead of once per
+session as an `UploadedFile`.
+
+Blobs live in an in-memory LRU bounded by PANEL_BLOB_BYTES and are always
+written under CACHE_DIR/blobs as well (bounded by PANEL_BLOB_DISK_BYTES),
+so a blob that falls out of memory is read back from disk.
+"""
+import os
+
+from .utils import storage
+from .utils.helpers import CACHE_DIR
+from .utils.storage import ByteLRU, content_digest, read_bytes
+
+MAX_BYTES = int(os.environ.get('PANEL_BLOB_BYTES', 128 * 1024 * 1024))
+DISK_MAX_ENTRIES = int(os.environ.get('PANEL_BLOB_DISK_ENTRIES', 2000))
+DISK_MAX_BYTES = int(os.environ.get('PANEL_BLOB_DISK_BYTES', 1024 * 1024 * 1024))
+BLOB_DIR = os.path.join(CACHE_DIR, 'blobs')
+
+_cache = ByteLRU(MAX_BYTES)
+
+
+def _path(digest, blob_dir):
+    return os.path.join(blob_dir, f'{digest}.bin')
+
+
+def put(upload, blob_dir=BLOB_DIR) -> str:
+    """Store an upload (bytes, path or file-like) and return its digest"""
+    data = read_bytes(upload)
+    digest = content_digest(data)
+    if _cache.get(digest) is None:
+        path = _path(digest, blob_dir)
+        if os.path.exists(path):
+            storage.touch(path)
+        else:
+            storage.write_atomic(path, data)
+            storage.evict(blob_dir, DISK_MAX_ENTRIES, DISK_MAX_BYTES)
+        _cache.put(digest, data)
+    return digest
+
+
+def get(digest, blob_dir=BLOB_DIR) -> bytes:
+    """Return the bytes stored under `digest`; raise KeyError if they are gone"""
+    data = _cache.get(digest)
+    if data is not None:
+        return data
+    path = _path(digest, blob_dir)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        raise KeyError(digest) from None
+    storage.touch(path)
+    return _cache.put(digest, data)
+
+
+def cache_info() -> dict:
+    return {'entries': len(_cache), 'bytes': _cache.nbytes, 'max_bytes': MAX_BYTES}
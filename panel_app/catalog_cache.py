@@ -0,0 +1,113 @@
+# file: panel_app/catalog_cache.py
+"""On-disk cache of parsed catalogs, keyed by the SHA-256 of the Excel bytes.
+
+Entries are stored as uncompressed Arrow IPC (Feather v2) files, with
+Parquet and pickle as fallbacks for frames Arrow cannot hold, so any
+process that shares the cache directory can skip the openpyxl parse.
+Arrow entries are opened memory-mapped: the columns of the returned frame
+point into the page cache, so several worker processes serving the same
+catalog share one copy of it instead of holding one each on the heap.
+Writes go through a temporary file and an atomic rename, and the directory
+is kept bounded by evicting the least recently used entries. A directory
+that cannot be written only costs the cache: the failure is logged and the
+catalog is served from the parse.
+"""
+import logging
+import os
+import pickle
+from functools import partial
+
+import pandas as pd
+
+from .utils import storage
+from .utils.helpers import CACHE_DIR
+
+CATALOG_CACHE_DIR = os.path.join(CACHE_DIR, 'catalogs')
+MAX_ENTRIES = int(os.environ.get('PANEL_CATALOG_CACHE_ENTRIES', 32))
+MAX_BYTES = int(os.environ.get('PANEL_CATALOG_CACHE_BYTES', 512 * 1024 * 1024))
+# bumped whenever the parsed catalog changes shape, so stale entries are not read
+FORMAT_VERSION = 5
+
+logger = logging.getLogger('panel_app.catalog_cache')
+
+
+def _write_parquet(df, path):
+    df.to_parquet(path)
+
+
+def _write_arrow(df, path):
+    import pyarrow as pa
+    from pyarrow import feather
+
+    # uncompressed, so readers can map the buffers instead of decoding them
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=True), path, compression='uncompressed')
+
+
+def _read_arrow(path):
+    from pyarrow import feather
+
+    # split_blocks keeps every column on its own mapped buffer instead of
+    # consolidating them into one heap block; the arrays are read-only
+    return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+
+
+def _write_pickle(df, path):
+    with open(path, 'wb') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+# (extension, writer, reader) in order of preference
+FORMATS = [
+    ('arrow', _write_arrow, _read_arrow),
+    ('parquet', _write_parquet, pd.read_parquet),
+    ('pkl', _write_pickle, _read_pickle),
+]
+
+
+def _entry_path(digest, ext, cache_dir):
+    return os.path.join(cache_dir, f'{digest}.v{FORMAT_VERSION}.{ext}')
+
+
+def get(digest, cache_dir=CATALOG_CACHE_DIR):
+    """Return the cached catalog for `digest`, or None"""
+    for ext, _, reader in FORMATS:
+        path = _entry_path(digest, ext, cache_dir)
+        try:
+            df = reader(path)
+        except FileNotFoundError:
+            continue
+        except Exception:
+            # entry written by an incompatible version or truncated
+            storage.remove_file(path)
+            continue
+        storage.touch(path)
+        return df
+    return None
+
+
+def put(digest, df, cache_dir=CATALOG_CACHE_DIR):
+    """Store `df` under `digest` in the first format that can hold it; never raises"""
+    try:
+        for ext, writer, _ in FORMATS:
+            try:
+                storage.replace_atomic(_entry_path(digest, ext, cache_dir), partial(writer, df))
+                break
+            except OSError:
+                raise
+            except Exception:
+                # the later formats are not memory-mapped; the frame has a dtype Arrow cannot hold
+                logger.warning("could not store catalog %s as %s", digest, ext, exc_info=True)
+                continue
+        evict(cache_dir)
+    except OSError:
+        logger.warning("could not write catalog cache in %s", cache_dir, exc_info=True)
+
+
+def evict(cache_dir=CATALOG_CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+    """Remove least recently used entries until the cache is within bounds"""
+    storage.evict(cache_dir, max_entries, max_bytes)
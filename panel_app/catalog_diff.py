@@ -0,0 +1,73 @@
+# file: panel_app/catalog_diff.py
+"""Compare two loads of a supplier price list by item key.
+
+Suppliers send a full new Excel for every change. `CatalogDiff` lines the
+new catalog up with the previous one by the stable keys from
+`catalog_loader.item_keys` and reports which items were added, removed,
+repriced or renamed. The dashboard shows it and uses it to refresh only
+the changed rows of the search index and the prices of the open order.
+"""
+import numpy as np
+import pandas as pd
+
+from . import perf, pricing
+
+TEXT_COLUMNS = ['הפריט', 'הערות']
+
+
+class CatalogDiff:
+    @perf.timed('catalog.diff')
+    def __init__(self, old_df, new_df):
+        old_positions = old_df.index.get_indexer(new_df.index)
+        in_both = old_positions >= 0
+        common = new_df.index[in_both]
+        old_positions = old_positions[in_both]
+        kept = np.zeros(len(old_df), dtype=bool)
+        kept[old_positions] = True
+        self.added = new_df.index[~in_both]
+        self.removed = old_df.index[~kept]
+        self.removed_items = old_df.loc[~kept, ['הפריט', 'מחיר יחידה']]
+
+        def column(df, col, positions):
+            return df[col].to_numpy()[positions]
+
+        # prices are compared in agorot so float noise is not a price change
+        old_prices = pricing.to_agorot(column(old_df, 'מחיר יחידה', old_positions))
+        new_prices = pricing.to_agorot(column(new_df, 'מחיר יחידה', in_both))
+        repriced = old_prices != new_prices
+        self.repriced = common[repriced]
+        self.old_prices = pricing.to_shekels(old_prices[repriced])
+        self.new_prices = pricing.to_shekels(new_prices[repriced])
+
+        renamed = np.zeros(len(common), dtype=bool)
+        for col in TEXT_COLUMNS:
+            renamed |= column(old_df, col, old_positions) != column(new_df, col, in_both)
+        self.renamed = common[renamed]
+        self.unchanged = len(common) - int((repriced | renamed).sum())
+
+    def __bool__(self):
+        return bool(len(self.added) or len(self.removed) or len(self.repriced) or len(self.renamed))
+
+    def summary(self):
+        return {
+            'added': len(self.added),
+            'removed': len(self.removed),
+            'repriced': len(self.repriced),
+            'renamed': len(self.renamed),
+            'unchanged': self.unchanged,
+        }
+
+    def repriced_frame(self, new_df):
+        """Return the repriced items with their old and new unit price"""
+        df = pd.DataFrame({
+            'הפריט': new_df.loc[self.repriced, 'הפריט'].to_numpy(),
+            'מחיר קודם': self.old_prices,
+            'מחיר חדש': self.new_prices,
+        }, index=self.repriced)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['שינוי %'] = np.where(
+                df['מחיר קודם'] != 0,
+                (df['מחיר חדש'] / df['מחיר קודם'] - 1) * 100,
+                np.nan,
+            ).round(1)
+        return df
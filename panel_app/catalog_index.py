@@ -0,0 +1,128 @@
+# file: panel_app/catalog_index.py
+"""Lookup structures built once per loaded catalog.
+
+`CatalogIndex` maps every category to its row positions and keeps a sorted
+token vocabulary over `הפריט` and `הערות` with the postings of all tokens
+stored back to back, so every prefix query is a binary search plus one
+contiguous slice, and multi-word queries are intersected as row masks.
+
+When a new version of the same price list is loaded, `updated` builds the
+new index from the previous one and tokenizes only the added and renamed
+rows; the postings of all other rows are carried over by position.
+"""
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from . import perf
+
+# niqqud and cantillation marks are dropped, final letters folded
+_FINAL_LETTERS = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
+_TRANSLATION = {cp: None for cp in range(0x0591, 0x05C8)}
+_TRANSLATION.update({ord(k): v for k, v in _FINAL_LETTERS.items()})
+_TRANSLATION.update({ord(ch): None for ch in '״׳"\''})
+_TRANSLATION.update({ord(ch): ' ' for ch in '\u05be-_/\\.,;:()[]{}+*|'})
+
+
+def normalize(text: str) -> str:
+    """Normalize Hebrew text for matching"""
+    return str(text).translate(_TRANSLATION).lower()
+
+
+def _tokens(df, positions=None):
+    """Return (row positions, tokens) of `הפריט` and `הערות` of the given rows"""
+    if positions is not None:
+        df = df.iloc[positions]
+    text = (df['הפריט'].fillna('').astype(str) + ' ' + df['הערות'].fillna('').astype(str))
+    text.index = np.arange(len(df)) if positions is None else positions
+    tokens = text.map(normalize).str.split().explode().dropna()
+    tokens = tokens[tokens != '']
+    return tokens.index.to_numpy(dtype=np.int64), tokens.to_numpy(dtype=object)
+
+
+class CatalogIndex:
+    @perf.timed('catalog.index')
+    def __init__(self, df):
+        self._set_categories(df)
+        rows, tokens = _tokens(df)
+        codes, vocabulary = pd.factorize(tokens, sort=True)
+        self._set_postings(rows, codes, list(vocabulary))
+
+    def _set_categories(self, df):
+        self.size = len(df)
+        self.categories = {
+            category: positions.astype(np.int64)
+            for category, positions in df.groupby('קטגוריה', sort=False).indices.items()
+        }
+
+    def _set_postings(self, rows, codes, vocabulary):
+        order = np.argsort(codes, kind='stable')
+        self.vocabulary = vocabulary
+        self.postings = rows[order]
+        self.offsets = np.searchsorted(codes[order], np.arange(len(vocabulary) + 1))
+
+    @perf.timed('catalog.index_update')
+    def updated(self, old_df, new_df, diff):
+        """Return the index of `new_df`, reusing this index of `old_df`.
+
+        `diff` is the `CatalogDiff` between the two; only its added and
+        renamed rows are tokenized again.
+        """
+        index = CatalogIndex.__new__(CatalogIndex)
+        index._set_categories(new_df)
+
+        # carry the postings of unchanged rows over to their new positions
+        moved = new_df.index.get_indexer(old_df.index)
+        moved[old_df.index.get_indexer(diff.renamed)] = -1
+        codes = np.repeat(np.arange(len(self.vocabulary)), np.diff(self.offsets))
+        rows = moved[self.postings]
+        kept = rows >= 0
+        rows, codes = rows[kept], codes[kept]
+
+        dirty = np.sort(new_df.index.get_indexer(diff.added.append(diff.renamed)))
+        new_rows, new_tokens = _tokens(new_df, dirty)
+        vocabulary = np.array(self.vocabulary, dtype=object)
+        added_words = np.setdiff1d(np.unique(new_tokens), vocabulary) if len(new_tokens) else []
+        if len(added_words):
+            vocabulary = np.sort(np.concatenate([vocabulary, np.asarray(added_words, dtype=object)]))
+            codes = np.searchsorted(vocabulary, np.array(self.vocabulary, dtype=object))[codes]
+        rows = np.concatenate([rows, new_rows])
+        codes = np.concatenate([codes, np.searchsorted(vocabulary, new_tokens)]).astype(np.int64)
+
+        # drop words no row uses any more
+        used = np.bincount(codes, minlength=len(vocabulary)) > 0
+        if not used.all():
+            codes = (np.cumsum(used) - 1)[codes]
+            vocabulary = vocabulary[used]
+        index._set_postings(rows, codes, list(vocabulary))
+        return index
+
+    def category_positions(self, category):
+        return self.categories.get(category, np.empty(0, dtype=np.int64))
+
+    def _prefix_mask(self, prefix):
+        lo = bisect.bisect_left(self.vocabulary, prefix)
+        hi = bisect.bisect_left(self.vocabulary, prefix + '\U0010ffff', lo)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.postings[self.offsets[lo]:self.offsets[hi]]] = True
+        return mask
+
+    def search(self, query, positions=None):
+        """Return the sorted positions of rows matching every word of `query`.
+
+        Words are matched as token prefixes so results follow the typing;
+        `positions` restricts the search (e.g. to one category).
+        """
+        mask = None
+        if positions is not None:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[positions] = True
+        for word in normalize(query).split():
+            if mask is None:
+                mask = self._prefix_mask(word)
+            else:
+                mask &= self._prefix_mask(word)
+        if mask is None:
+            return np.arange(self.size)
+        return np.flatnonzero(mask)
@@ -1,47 +1,255 @@
 # file: panel_app/catalog_loader.py
+import io
+import os
+from array import array
+
+import numpy as np
 import pandas as pd
-import streamlit as st
 
+from . import catalog_cache, perf
+from .utils.storage import content_digest, read_bytes
+
+SHEET_NAME = 'גיליון1'
+HEADER_ROW = 8
+# files above this size are read with the streaming parser
+STREAMING_THRESHOLD = int(os.environ.get('PANEL_STREAMING_THRESHOLD', 5 * 1024 * 1024))
+# Arrow-backed text whatever the pandas version's default string dtype is
+TEXT_DTYPE = pd.StringDtype('pyarrow')
+
+
+def item_number(value):
+    """Return the catalog number as text, without a trailing `.0`"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def item_keys(df):
+    """Return a stable key for every catalog row.
+
+    The key is the catalog number (`מספר`) where the row has one, and
+    otherwise a hash of its category, name and notes, so it does not change
+    when rows are added or removed above it or when the price changes.
+    Repeated keys get a `#2`, `#3`... suffix in row order.
+    """
+    content = pd.util.hash_pandas_object(df[['קטגוריה', 'הפריט', 'הערות']].astype(str), index=False)
+    keys = pd.Series([f'h{h:016x}' for h in content.to_numpy()], index=df.index, dtype=object)
+    if 'מספר' in df.columns:
+        numbers = df['מספר']
+        numbered = numbers.notna() & (numbers.astype(str).str.strip() != '')
+        keys[numbered] = [item_number(n) for n in numbers[numbered]]
+    repeat = keys.groupby(keys, sort=False).cumcount()
+    keys = keys.where(repeat == 0, keys + '#' + (repeat + 1).astype(str))
+    return pd.Index(keys.to_numpy(), dtype=str)
+
+
+def _first_label(values):
+    """Return the first non-empty cell of a header row, or None"""
+    for value in values:
+        if pd.notna(value) and str(value).strip() != '':
+            return str(value).strip()
+    return None
+
+
+@perf.timed('catalog.categories')
+def assign_categories(df):
+    """Return the category of every row.
+
+    Header rows (no unit price) carry the category label in their first
+    non-empty cell; priced rows inherit the label of the last header above
+    them. Header rows themselves get an empty category. The `כמות` and
+    `קטגוריה` columns are filled in by the loader, so they are not searched
+    for a label: a blank separator row has no label and leaves the category
+    unchanged (it used to start a category named '0').
+    """
+    price = df['מחיר יחידה']
+    is_header = price.isna() | (price == '')
+
+    headers = df.loc[is_header, [c for c in df.columns if c not in ('כמות', 'קטגוריה')]]
+    labels = pd.Series(None, index=df.index, dtype=object)
+    labels[is_header] = [_first_label(row) for row in headers.to_numpy(dtype=object)]
+
+    categories = labels.ffill().fillna('')
+    categories[is_header] = ''
+    return categories.astype(str)
+
+
+def _normalize_columns(columns):
+    rename_dict = {
+        "מס'": "מספר",
+        'סה"כ': 'סהכ'
+    }
+    columns = [rename_dict.get(col, col) for col in (str(c).strip() for c in columns)]
+
+    for i, col in enumerate(columns):
+        if 'פריט' in col and col != 'הפריט':
+            columns[i] = 'הפריט'
+            break
+    return columns
+
+
+def _finish_catalog(df):
+    df = df[pd.notna(df['מחיר יחידה'])].copy()
+
+    df['מחיר יחידה'] = pd.to_numeric(df['מחיר יחידה'], errors='coerce').fillna(0)
+
+    if 'הערות' not in df.columns:
+        df['הערות'] = ''
+    df['הערות'] = df['הערות'].fillna('')
+
+    df.index = item_keys(df)
+    return compact_dtypes(df)
+
+
+def compact_dtypes(df):
+    """Store the catalog in compact dtypes.
 
-@st.cache_data
-def load_catalog(file):
+    Text is stored as Arrow strings (TEXT_DTYPE, with missing text as ''):
+    `הפריט`, `הערות`, the catalog number `מספר` (written as `item_number`,
+    since suppliers mix numbers like 1001 with codes like 'A-12') and any
+    other column of mixed values, so the frame always fits the Arrow cache
+    entry. `קטגוריה` becomes categorical and `כמות` int32 (the quantities
+    themselves live in the session `Order`). The supplier's line total
+    column is dropped; the order recomputes it.
+    """
+    df = df.drop(columns=['סהכ'], errors='ignore')
+    if 'מספר' in df.columns:
+        df['מספר'] = [item_number(n) if pd.notna(n) else '' for n in df['מספר']]
+    for col in df.columns:
+        if col in ('הפריט', 'הערות', 'מספר') or df[col].dtype == object:
+            values = df[col].where(df[col].notna(), '')
+            df[col] = values.astype(str).astype(TEXT_DTYPE)
+    df['קטגוריה'] = df['קטגוריה'].astype('category')
+    df['כמות'] = np.zeros(len(df), dtype='int32')
+    return df
+
+
+def parse_catalog(file):
+    """Parse a supplier Excel price list into the normalized catalog"""
+    df = pd.read_excel(file, sheet_name=SHEET_NAME, header=HEADER_ROW, engine='openpyxl')
+    df.columns = _normalize_columns(df.columns)
+
+    df['כמות'] = 0
+    df['קטגוריה'] = ''
+    df['קטגוריה'] = assign_categories(df)
+
+    return _finish_catalog(df)
+
+
+def _calamine_rows(file):
+    from python_calamine import CalamineWorkbook
+
+    sheet = CalamineWorkbook.from_filelike(file).get_sheet_by_name(SHEET_NAME)
+    for row in sheet.iter_rows():
+        yield [int(v) if isinstance(v, float) and v.is_integer() else v for v in row]
+
+
+def _openpyxl_rows(file):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
     try:
-        df = pd.read_excel(file, sheet_name='גיליון1', header=8, engine='openpyxl')
-        df.columns = df.columns.str.strip()
-
-        rename_dict = {
-            "מס'": "מספר",
-            'סה"כ': 'סהכ'
-        }
-        df.rename(columns=rename_dict, inplace=True)
-
-        for col in df.columns:
-            if 'פריט' in col and col != 'הפריט':
-                df.rename(columns={col: 'הפריט'}, inplace=True)
-                break
-
-        df['כמות'] = 0
-        df['קטגוריה'] = ''
-        current_category = ''
-
-        for idx in df.index:
-            if pd.isna(df.at[idx, 'מחיר יחידה']) or df.at[idx, 'מחיר יחידה'] == '':
-                for col in df.columns:
-                    if pd.notna(df.at[idx, col]) and str(df.at[idx, col]).strip() != '':
-                        current_category = str(df.at[idx, col]).strip()
-                        break
-            else:
-                df.at[idx, 'קטגוריה'] = current_category
-
-        df = df[pd.notna(df['מחיר יחידה'])].copy()
-
-        df['מחיר יחידה'] = pd.to_numeric(df['מחיר יחידה'], errors='coerce').fillna(0)
-
-        if 'הערות' not in df.columns:
-            df['הערות'] = ''
-        df['הערות'] = df['הערות'].fillna('')
-
-        return df
-    except Exception as e:
-        st.error(f"שגיאה בטעינת הקובץ: {str(e)}")
-        return None
+        yield from wb[SHEET_NAME].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _sheet_rows(file):
+    """Yield the sheet rows as value tuples, using calamine when installed"""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return _openpyxl_rows(file)
+    return _calamine_rows(file)
+
+
+def _unique_columns(header):
+    columns, seen = [], {}
+    for i, name in enumerate(header):
+        name = f'Unnamed: {i}' if name is None or name == '' else name
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def stream_catalog(file):
+    """Parse a price list row by row without loading the whole workbook.
+
+    Produces the same catalog as `parse_catalog`: preamble rows are skipped,
+    categories are assigned while reading and only priced rows are kept, in
+    compact per-column buffers.
+    """
+    rows = _sheet_rows(file)
+    for _ in range(HEADER_ROW):
+        next(rows, None)
+    columns = _normalize_columns(_unique_columns(next(rows)))
+    width = len(columns)
+    price_col = columns.index('מחיר יחידה')
+    label_cols = [i for i, col in enumerate(columns) if col not in ('כמות', 'קטגוריה')]
+
+    index = array('q')
+    data = [[] for _ in columns]
+    categories = []
+    # like read_excel, integer columns with gaps anywhere in the sheet are float
+    has_missing = [False] * width
+    current_category = ''
+    position = 0
+    for row in rows:
+        row = [None if v == '' else v for v in row[:width]]
+        if all(v is None for v in row):
+            continue
+        row.extend([None] * (width - len(row)))
+        if None in row:
+            for i, value in enumerate(row):
+                if value is None:
+                    has_missing[i] = True
+        price = row[price_col]
+        if price is None:
+            label = _first_label(row[i] for i in label_cols)
+            if label is not None:
+                current_category = label
+        else:
+            index.append(position)
+            for values, value in zip(data, row):
+                values.append(value)
+            categories.append(current_category)
+        position += 1
+
+    index = pd.Index(index, dtype='int64')
+    df = pd.DataFrame({
+        col: pd.Series(values, index=index, dtype=float if all(v is None for v in values) else None)
+        for col, values in zip(columns, data)
+    })
+    for col, missing in zip(columns, has_missing):
+        if missing and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype(float)
+    df['כמות'] = 0
+    df['קטגוריה'] = pd.Series(categories, index=index, dtype=str)
+    return _finish_catalog(df)
+
+
+@perf.timed('catalog.load')
+def load_catalog_file(file, streaming=None):
+    """Load a catalog through the on-disk cache; raises if the file is invalid"""
+    data = read_bytes(file)
+    digest = content_digest(data)
+    with perf.stage('catalog.cache_read'):
+        df = catalog_cache.get(digest)
+    if df is None:
+        if streaming is None:
+            streaming = len(data) > STREAMING_THRESHOLD
+        parse = stream_catalog if streaming else parse_catalog
+        with perf.stage('catalog.parse'):
+            df = parse(io.BytesIO(data))
+        with perf.stage('catalog.cache_write'):
+            catalog_cache.put(digest, df)
+        # use the mapped entry too, so this process does not keep a heap copy
+        cached = catalog_cache.get(digest)
+        if cached is not None:
+            df = cached
+    return df
+
@@ -1,16 +1,288 @@
 # file: panel_app/dashboard.py
 import os
 from datetime import date
+from functools import partial
 
 import pandas as pd
 import streamlit as st
 
-from catalog_loader import load_catalog
-from pdf_generator import create_enhanced_pdf
-from utils.helpers import asset_path
-from utils.rtl import rtl
+from . import blob_store, catalog_cache, pdf_cache, pdf_jobs, perf, pricing
+from .catalog_diff import CatalogDiff
+from .order_model import Order
+from .streamlit_adapter import get_catalog_index, get_quote_store, load_catalog
+from .utils.helpers import asset_path
+from .utils.rtl import rtl
+from .utils.storage import content_digest
+
+ALL_CATEGORIES = "כל הקטגוריות"
+PAGE_SIZES = [25, 50, 100, 200]
+PDF_POLL_SECONDS = 0.5
+HISTORY_PAGE_SIZE = 20
+
+
+@perf.timed('dashboard.editor')
+def render_catalog_editor(catalog_df, index):
+    """Render one page of the catalog as an editable table.
+
+    Only the rows of the current page are sent to the browser, so a rerun
+    costs the same for a 100-row and a 100k-row catalog. Quantities are kept
+    in the session `Order` and survive paging, filtering and reruns; only the
+    rows edited in the table are applied to it.
+    """
+    order = st.session_state.order
+
+    query = st.text_input("חיפוש מוצר:", placeholder="הקלד שם מוצר או הערה")
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        categories = [c for c in index.categories if c]
+        category = st.selectbox("קטגוריה:", [ALL_CATEGORIES, *categories])
+    positions = None if category == ALL_CATEGORIES else index.category_positions(category)
+    if query.strip():
+        positions = index.search(query, positions)
+    view = catalog_df if positions is None else catalog_df.iloc[positions]
+    with col2:
+        page_size = st.selectbox("פריטים בעמוד:", PAGE_SIZES, index=1)
+    with col3:
+        pages = max(1, -(-len(view) // page_size))
+        page = st.number_input(
+            "עמוד:", min_value=1, max_value=pages, value=1, step=1,
+            key=f"catalog_page_{category}_{query}_{page_size}",
+        )
+    st.caption(f"עמוד {page} מתוך {pages} · {len(view):,} מוצרים")
+
+    page_df = view.iloc[(page - 1) * page_size:page * page_size]
+    prices = page_df['מחיר יחידה']
+    editor_df = pd.DataFrame({
+        'קטגוריה': page_df['קטגוריה'],
+        'הפריט': page_df['הפריט'],
+        'הערות': page_df['הערות'],
+        'מחיר יחידה': [f"₪{p:,.0f}" if pd.notna(p) and p != 0 else "לפי מידה" for p in prices],
+        'כמות': [order.quantity(idx) for idx in page_df.index],
+    }, index=page_df.index)
+
+    # the editor keeps its edits by row position; a new catalog or order gets a new widget
+    key = (f"catalog_editor_{st.session_state.catalog_digest}_{order.generation}"
+           f"_{category}_{query}_{page_size}_{page}")
+    st.data_editor(
+        editor_df,
+        column_config={
+            'כמות': st.column_config.NumberColumn("כמות", min_value=0, step=1, format="%d"),
+        },
+        disabled=['קטגוריה', 'הפריט', 'הערות', 'מחיר יחידה'],
+        hide_index=True,
+        use_container_width=True,
+        key=key,
+    )
+
+    for pos, changes in st.session_state[key]['edited_rows'].items():
+        if 'כמות' in changes:
+            qty = changes['כמות']
+            order.set_quantity(page_df.index[int(pos)], int(qty) if qty else 0, prices.iat[int(pos)])
+
+
+def refresh_catalog(digest, catalog_df):
+    """Return the index of the uploaded catalog.
+
+    Whenever the catalog changes the order is moved onto its prices. When
+    it replaces an earlier upload still in the cache, the two are also
+    diffed by item key, the index is updated from the previous one and the
+    diff is kept for display.
+    """
+    previous = st.session_state.catalog_digest
+    if previous == digest:
+        return get_catalog_index(digest, catalog_df)
+
+    old_df = catalog_cache.get(previous) if previous is not None else None
+    if old_df is None:
+        diff = None
+        index = get_catalog_index(digest, catalog_df)
+    else:
+        diff = CatalogDiff(old_df, catalog_df)
+        old_index = get_catalog_index(previous, old_df)
+        index = get_catalog_index(digest, catalog_df, _previous=(old_index, old_df, diff))
+    dropped, repriced = st.session_state.order.reprice(catalog_df)
+    changed = diff is not None or dropped or repriced
+    st.session_state.catalog_changes = (diff, dropped, repriced) if changed else None
+    st.session_state.catalog_digest = digest
+    return index
+
+
+def render_catalog_changes(catalog_df):
+    diff, dropped, repriced = st.session_state.catalog_changes
+    if diff is not None and not diff:
+        st.info("הקטלוג החדש זהה לקטלוג הקודם")
+    elif diff is not None:
+        counts = diff.summary()
+        st.info(
+            f"עודכן קטלוג: {counts['added']} פריטים חדשים, {counts['removed']} הוסרו, "
+            f"{counts['repriced']} שינו מחיר, {counts['renamed']} שינו תיאור"
+        )
+    if dropped:
+        st.warning(f"{len(dropped)} פריטים שהוסרו מהקטלוג הוסרו גם מההזמנה")
+    if repriced:
+        st.warning(f"המחיר של {len(repriced)} פריטים בהזמנה עודכן למחיר החדש")
+    if not diff:
+        return
+    with st.expander("פירוט השינויים בקטלוג"):
+        if len(diff.repriced):
+            st.markdown("**שינויי מחיר**")
+            st.dataframe(diff.repriced_frame(catalog_df), use_container_width=True, hide_index=True)
+        if len(diff.added):
+            st.markdown("**פריטים חדשים**")
+            st.dataframe(catalog_df.loc[diff.added, ['הפריט', 'מחיר יחידה']],
+                         use_container_width=True, hide_index=True)
+        if len(diff.removed):
+            st.markdown("**פריטים שהוסרו**")
+            st.dataframe(diff.removed_items, use_container_width=True, hide_index=True)
+
+
+@st.fragment(run_every=PDF_POLL_SECONDS)
+def render_pdf_progress(job_id):
+    """Poll a running PDF job without rerunning the whole page"""
+    job = pdf_jobs.get(job_id)
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"יוצר הצעת מחיר... {job.elapsed:.0f} שניות")
+
+
+def render_pdf_job(job_id):
+    job = pdf_jobs.get(job_id)
+    if job is None:
+        st.session_state.pdf_job = None
+        st.warning("ההצעה כבר אינה זמינה להורדה, יש ליצור אותה מחדש")
+        return
+    if not job.done:
+        render_pdf_progress(job_id)
+        return
+    if job.status == pdf_jobs.FAILED:
+        st.error(f"שגיאה ביצירת ההצעה: {job.error}")
+        return
+
+    st.success("ההצעה נוצרה בהצלחה!")
+    st.download_button(
+        label="📥 הורד הצעת מחיר",
+        data=partial(pdf_jobs.read_result, job_id),
+        file_name=f"הצעת_מחיר_{st.session_state.customer_data['name']}_{st.session_state.customer_data['email']}_{date.today()}.pdf",
+        mime="application/pdf",
+        on_click="ignore",
+        use_container_width=True,
+    )
+
+    if st.button("🔄 התחל הצעה חדשה", use_container_width=True):
+        pdf_jobs.discard(job_id)
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+        st.rerun()
+
+
+def remember_upload(name, upload):
+    """Keep only the digest of an uploaded render in the session; each upload is stored once"""
+    if st.session_state.upload_ids.get(name) != upload.file_id:
+        st.session_state[name] = blob_store.put(upload)
+        st.session_state.upload_ids[name] = upload.file_id
+
+
+def session_demos():
+    """Return the bytes of the session's renders (demo1, demo2) from the shared blob store"""
+    demos = []
+    for name in ('demo1', 'demo2'):
+        digest = st.session_state[name]
+        try:
+            demos.append(None if digest is None else blob_store.get(digest))
+        except KeyError:
+            st.session_state[name] = None
+            st.warning("אחת ההדמיות כבר אינה זמינה, יש להעלות אותה מחדש")
+            demos.append(None)
+    return demos
+
+
+def opened_quote_items():
+    """Return the items of the saved quote opened from the history, read back from the store"""
+    quote_id = st.session_state.opened_quote
+    quote = get_quote_store().get(quote_id) if quote_id is not None else None
+    return quote['items'] if quote is not None else pd.DataFrame()
+
+
+def save_quote(items_df, demo1, demo2):
+    """Save the current quote once; pressing create again on the same inputs keeps its id"""
+    key = pdf_cache.quote_key(st.session_state.customer_data, items_df, demo1, demo2)
+    saved = st.session_state.saved_quote
+    if saved and saved[0] == key:
+        return saved[1]
+    quote_id = get_quote_store().save(st.session_state.customer_data, items_df, demo1, demo2)
+    st.session_state.saved_quote = (key, quote_id)
+    return quote_id
+
+
+def open_quote(quote):
+    """Load a saved quote into the session so it can be edited and created again"""
+    order = Order()
+    order.generation = st.session_state.order.generation + 1
+    items = quote['items']
+    for key, qty, price in zip(items.index, items['כמות'], items['מחיר יחידה']):
+        order.set_quantity(key, int(qty), price)
+    st.session_state.customer_data = quote['customer_data']
+    st.session_state.order = order
+    st.session_state.opened_quote = quote['id']
+    for name in ('demo1', 'demo2'):
+        st.session_state[name] = None if quote[name] is None else blob_store.put(quote[name])
+    st.session_state.pdf_job = None
+    st.session_state.saved_quote = (
+        pdf_cache.quote_key(quote['customer_data'], items, quote['demo1'], quote['demo2']), quote['id'],
+    )
+    # a loaded catalog reprices the quote on the next run, dropping the items it no longer has
+    st.session_state.catalog_digest = None
+    st.session_state.catalog_changes = None
+
+
+@perf.timed('dashboard.history')
+def render_history():
+    store = get_quote_store()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input("חיפוש הצעה:", placeholder="שם לקוח, טלפון או תאריך (YYYY-MM-DD)")
+    with col2:
+        page = st.number_input("עמוד:", min_value=1, value=1, step=1)
+    quotes, total = store.search(query, int(page), HISTORY_PAGE_SIZE)
+    pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+    st.caption(f"{total:,} הצעות · עמוד {int(page)} מתוך {pages}")
+    if not quotes:
+        st.info("לא נמצאו הצעות שמורות")
+        return
+
+    st.dataframe(
+        pd.DataFrame(quotes).rename(columns={
+            'id': 'מספר', 'created_at': 'נשמרה', 'quote_date': 'תאריך', 'name': 'לקוח',
+            'phone': 'טלפון', 'item_count': 'פריטים', 'total': 'סה"כ',
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+    labels = {q['id']: f"#{q['id']} · {q['name']} · {q['quote_date']} · ₪{q['total']:,.2f}" for q in quotes}
+    quote_id = st.selectbox("בחר הצעה:", list(labels), format_func=labels.get)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("📂 פתח הצעה", use_container_width=True):
+            quote = store.get(quote_id)
+            if quote is None:
+                st.warning("ההצעה נמחקה")
+            else:
+                open_quote(quote)
+                st.toast("ההצעה נטענה, ניתן לערוך אותה וליצור אותה מחדש")
+                st.rerun()
+    with col2:
+        st.download_button(
+            label="📥 הורד PDF",
+            data=partial(store.render_pdf, quote_id),
+            file_name=f"הצעת_מחיר_{quote_id}.pdf",
+            mime="application/pdf",
+            on_click="ignore",
+            use_container_width=True,
+        )
 
 
+@perf.timed('dashboard.render')
 def render_dashboard():
     # Header with logo
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -56,19 +328,36 @@ def render_dashboard():
             'contractor_discount': 0.0,
         }
 
-    if 'selected_items' not in st.session_state:
-        st.session_state.selected_items = pd.DataFrame()
+    if 'opened_quote' not in st.session_state:
+        st.session_state.opened_quote = None
+
+    if 'order' not in st.session_state:
+        st.session_state.order = Order()
+
+    if 'catalog_digest' not in st.session_state:
+        st.session_state.catalog_digest = None
+    if 'catalog_changes' not in st.session_state:
+        st.session_state.catalog_changes = None
 
+    if 'pdf_job' not in st.session_state:
+        st.session_state.pdf_job = None
+
+    if 'saved_quote' not in st.session_state:
+        st.session_state.saved_quote = None
+
+    # renders are kept as blob_store digests, not as the uploaded files
     if 'demo1' not in st.session_state:
         st.session_state.demo1 = None
     if 'demo2' not in st.session_state:
         st.session_state.demo2 = None
+    if 'upload_ids' not in st.session_state:
+        st.session_state.upload_ids = {}
 
     # UI Tabs
-    tab1, tab2, tab3 = st.tabs(["📝 פרטי לקוח", "🛒 בחירת מוצרים", "📄 יצירת הצעה"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📝 פרטי לקוח", "🛒 בחירת מוצרים", "📄 יצירת הצעה", "🗂️ הצעות שמורות"])
 
     # Tab 1: customer details
-    with tab1:
+    with tab1, perf.stage('dashboard.customer'):
         st.subheader("הזן פרטי לקוח")
 
         col1, col2 = st.columns(2)
@@ -124,7 +413,7 @@ def render_dashboard():
         )
 
     # Tab 2: catalog selection
-    with tab2:
+    with tab2, perf.stage('dashboard.catalog'):
         st.subheader("בחר מוצרים מהקטלוג")
 
         uploaded_file = st.file_uploader(
@@ -133,59 +422,25 @@ def render_dashboard():
             help="קובץ Excel עם רשימת המוצרים",
         )
 
+        catalog_df = None
+        selected_df = pd.DataFrame()
         if uploaded_file:
-            catalog_df = load_catalog(uploaded_file)
+            digest = content_digest(uploaded_file.getvalue())
+            catalog_df = load_catalog(digest, uploaded_file)
 
             if catalog_df is not None:
                 st.success("הקטלוג נטען בהצלחה!")
+                index = refresh_catalog(digest, catalog_df)
+                if st.session_state.catalog_changes:
+                    render_catalog_changes(catalog_df)
 
                 st.markdown("### רשימת מוצרים - הזן כמות ליד כל מוצר")
-                edited_df = catalog_df.copy()
-                categories = edited_df['קטגוריה'].unique()
-
-                for category in categories:
-                    if category:
-                        st.markdown(f"<div class='category-header'>{category}</div>", unsafe_allow_html=True)
-
-                    category_df = edited_df[edited_df['קטגוריה'] == category]
-
-                    for idx in category_df.index:
-                        col1, col2, col3, col4, col5, col6 = st.columns([3, 2, 1.5, 1, 1, 1])
-
-                        with col1:
-                            st.write(edited_df.at[idx, 'הפריט'])
-                        with col2:
-                            st.write(edited_df.at[idx, 'הערות'])
-                        with col3:
-                            price = edited_df.at[idx, 'מחיר יחידה']
-                            if pd.notna(price) and price != 0:
-                                st.write(f"₪{price:,.0f}")
-                            else:
-                                st.write("לפי מידה")
-                        with col4:
-                            qty = st.number_input(
-                                "כמות",
-                                min_value=0,
-                                value=0,
-                                step=1,
-                                key=f"qty_{idx}",
-                                label_visibility="collapsed",
-                            )
-                            edited_df.at[idx, 'כמות'] = qty
-                        with col5:
-                            if qty > 0 and pd.notna(price) and price != 0:
-                                total = qty * price
-                                st.write(f"₪{total:,.0f}")
-                                edited_df.at[idx, 'סהכ'] = total
-                            else:
-                                st.write("-")
-                                edited_df.at[idx, 'סהכ'] = 0
-
-                selected_df = edited_df[edited_df['כמות'] > 0].copy()
+                render_catalog_editor(catalog_df, index)
 
-                if not selected_df.empty:
-                    st.session_state.selected_items = selected_df
+                order = st.session_state.order
+                selected_df = order.items_frame(catalog_df)
 
+                if not selected_df.empty:
                     st.markdown("### סיכום הזמנה")
                     display_columns = ['הפריט', 'הערות', 'כמות', 'מחיר יחידה', 'סהכ']
                     st.dataframe(
@@ -194,17 +449,25 @@ def render_dashboard():
                         hide_index=True,
                     )
 
-                    subtotal = selected_df['סהכ'].sum()
-                    vat = subtotal * 0.17
-                    discount = (subtotal + vat) * (st.session_state.customer_data['discount'] / 100)
-                    total = subtotal + vat - discount
+                    totals = order.totals(
+                        st.session_state.customer_data['discount'],
+                        st.session_state.customer_data['contractor_discount'],
+                    )
+                    contractor_discount, subtotal, vat, discount, total = (
+                        totals['contractor_discount'], totals['net'], totals['vat'],
+                        totals['discount'], totals['total'],
+                    )
+                    contractor_line = (
+                        f"<p>הנחת קבלן: <b>-₪{contractor_discount:,.2f}</b></p>" if contractor_discount else ""
+                    )
 
                     st.markdown(
                         f"""
                         <div class="summary-box">
                             <h4>סיכום תשלום:</h4>
+                            {contractor_line}
                             <p>סכום ביניים: <b>₪{subtotal:,.2f}</b></p>
-                            <p>מע"מ (17%): <b>₪{vat:,.2f}</b></p>
+                            <p>מע"מ ({pricing.vat_label()}): <b>₪{vat:,.2f}</b></p>
                             <p>הנחה ({st.session_state.customer_data['discount']}%): <b>-₪{discount:,.2f}</b></p>
                             <hr>
                             <h3>סך הכל לתשלום: <span style=\"color: #d32f2f;\">₪{total:,.2f}</span></h3>
@@ -216,12 +479,14 @@ def render_dashboard():
                     st.info("לא נבחרו מוצרים עדיין. הזן כמות ליד המוצרים הרצויים.")
 
     # Tab 3: create quote
-    with tab3:
+    with tab3, perf.stage('dashboard.quote'):
         st.subheader("יצירת הצעת מחיר")
+        if catalog_df is None:
+            selected_df = opened_quote_items()
 
         if not st.session_state.customer_data['name']:
             st.warning("יש להזין פרטי לקוח בטאב הראשון")
-        elif isinstance(st.session_state.selected_items, pd.DataFrame) and st.session_state.selected_items.empty:
+        elif selected_df.empty:
             st.warning("יש לבחור מוצרים בטאב השני")
         else:
             st.markdown("### הוסף הדמיה (אופציונלי)")
@@ -232,7 +497,7 @@ def render_dashboard():
             )
 
             if demo_file:
-                st.session_state.demo1 = demo_file
+                remember_upload('demo1', demo_file)
                 st.success("ההדמיה נוספה בהצלחה!")
                 st.image(demo_file, caption="תצוגה מקדימה של ההדמיה", use_column_width=True)
 
@@ -244,32 +509,29 @@ def render_dashboard():
             )
 
             if demo2_file:
-                st.session_state.demo2 = demo2_file
+                remember_upload('demo2', demo2_file)
                 st.success("הדמיה נוספת נוספה בהצלחה!")
                 st.image(demo2_file, caption="תצוגה מקדימה של הדמיה נוספת", use_column_width=True)
 
             if st.button("🎯 צור הצעת מחיר", type="primary", use_container_width=True):
-                with st.spinner("יוצר הצעת מחיר..."):
-                    pdf_buffer = create_enhanced_pdf(
-                        st.session_state.customer_data,
-                        st.session_state.selected_items,
-                        st.session_state.demo1,
-                        st.session_state.demo2,
+                if st.session_state.pdf_job:
+                    pdf_jobs.discard(st.session_state.pdf_job)
+                demo1, demo2 = session_demos()
+                save_quote(selected_df, demo1, demo2)
+                try:
+                    st.session_state.pdf_job = pdf_jobs.submit(
+                        st.session_state.customer_data, selected_df, demo1, demo2,
                     )
+                except pdf_jobs.QueueFull:
+                    st.session_state.pdf_job = None
+                    st.error("השרת עמוס כרגע, נסה שוב בעוד מספר שניות")
 
-                    st.success("ההצעה נוצרה בהצלחה!")
-                    st.download_button(
-                        label="📥 הורד הצעת מחיר",
-                        data=pdf_buffer,
-                        file_name=f"הצעת_מחיר_{st.session_state.customer_data['name']}_{st.session_state.customer_data['email']}_{date.today()}.pdf",
-                        mime="application/pdf",
-                        use_container_width=True,
-                    )
+            if st.session_state.pdf_job:
+                render_pdf_job(st.session_state.pdf_job)
 
-                    if st.button("🔄 התחל הצעה חדשה", use_container_width=True):
-                        for key in st.session_state.keys():
-                            del st.session_state[key]
-                        st.rerun()
+    # Tab 4: saved quotes
+    with tab4:
+        render_history()
 
     st.markdown("---")
     st.markdown(
@@ -0,0 +1,89 @@
+# file: panel_app/order_model.py
+"""Sparse order model kept in the session.
+
+Only the selected items are stored (item key -> quantity, plus the unit
+price they were selected at), and the subtotal is updated on every
+quantity change instead of being summed over the whole catalog. The
+subtotal is kept in integer agorot, so it stays exact however many edits
+are applied to it.
+
+`generation` changes whenever the order is replaced wholesale (moved onto
+a new catalog, or a saved quote opened in its place); the quantity editor
+keys its widget on it, so edits made against the previous rows are never
+replayed onto the new ones.
+"""
+from . import pricing
+
+
+class Order:
+    def __init__(self):
+        self.quantities = {}
+        self.prices = {}
+        self.subtotal = 0
+        self.generation = 0
+
+    def __len__(self):
+        return len(self.quantities)
+
+    def quantity(self, item):
+        return self.quantities.get(item, 0)
+
+    def set_quantity(self, item, qty, price):
+        """Set the quantity of one item; return True if the order changed"""
+        old_qty = self.quantities.get(item, 0)
+        if qty == old_qty:
+            return False
+        if old_qty:
+            self.subtotal -= old_qty * int(pricing.to_agorot(self.prices[item]))
+        if qty > 0:
+            self.quantities[item] = qty
+            self.prices[item] = price
+            self.subtotal += qty * int(pricing.to_agorot(price))
+        else:
+            del self.quantities[item]
+            del self.prices[item]
+        return True
+
+    def clear(self):
+        self.quantities.clear()
+        self.prices.clear()
+        self.subtotal = 0
+
+    def reprice(self, catalog_df):
+        """Move the order onto a newly loaded catalog.
+
+        Items are matched by key; their unit price is updated and items that
+        are no longer in the catalog are dropped, and a new generation starts.
+        Returns the keys that were (dropped, repriced).
+        """
+        dropped, repriced = [], []
+        prices = catalog_df['מחיר יחידה']
+        for item, qty in list(self.quantities.items()):
+            if item not in catalog_df.index:
+                self.set_quantity(item, 0, self.prices[item])
+                dropped.append(item)
+            elif pricing.to_agorot(prices[item]) != pricing.to_agorot(self.prices[item]):
+                self.set_quantity(item, 0, self.prices[item])
+                self.set_quantity(item, qty, prices[item])
+                repriced.append(item)
+        self.generation += 1
+        return dropped, repriced
+
+    def totals(self, discount_pct=0, contractor_discount=0):
+        """Return the `pricing.order_totals` of the order, in shekels"""
+        totals = pricing.order_totals([self.subtotal], discount_pct, contractor_discount)
+        return {name: value / 100 for name, value in totals.items()}
+
+    def items_frame(self, catalog_df):
+        """Return the selected catalog rows with `כמות` and `סהכ`, in catalog order.
+
+        `מחיר יחידה` is the price the item is held at in the order, so the
+        rows are priced the same as `totals` even before `reprice`.
+        """
+        positions = catalog_df.index.get_indexer(list(self.quantities))
+        positions = sorted(p for p in positions if p >= 0)
+        df = catalog_df.iloc[positions].copy()
+        df['מחיר יחידה'] = [self.prices[idx] for idx in df.index]
+        df['כמות'] = [self.quantities[idx] for idx in df.index]
+        df['סהכ'] = pricing.to_shekels(pricing.line_totals(df['מחיר יחידה'], df['כמות'].to_numpy()))
+        return df
@@ -0,0 +1,172 @@
+# file: panel_app/pdf_cache.py
+"""Cache finished quote PDFs by a canonical hash of their inputs.
+
+The same customer, items and renders produce the same PDF, yet pressing the
+button again after a rerun used to render it from scratch. `quote_key`
+hashes everything the PDF is drawn from: the customer fields, every cell
+and column of the items frame, the SHA-256 of each render, the image
+settings and the VAT rate and rounding rule the totals are priced with.
+`render` returns the stored bytes for a known key and renders and stores
+them otherwise.
+
+Entries live in an in-memory LRU bounded by PANEL_PDF_CACHE_BYTES; PDFs
+larger than PANEL_PDF_CACHE_ENTRY_BYTES are not kept in memory. When
+PANEL_PDF_CACHE_DISK is set every entry, whatever its size, is also written
+under CACHE_DIR/pdfs, bounded like the catalog cache, so other processes
+and restarts share them. `get_file` copies a cached PDF into a file
+without reading large ones into memory. Bump KEY_VERSION whenever the
+layout changes so old entries are not served.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+from . import pricing
+from .pdf_generator import create_enhanced_pdf
+from .utils import storage
+from .utils.helpers import CACHE_DIR
+from .utils.images import JPEG_QUALITY, RENDER_DPI
+from .utils.storage import ByteLRU, content_digest, read_bytes
+
+KEY_VERSION = 1
+MAX_BYTES = int(os.environ.get('PANEL_PDF_CACHE_BYTES', 64 * 1024 * 1024))
+MAX_ENTRY_BYTES = int(os.environ.get('PANEL_PDF_CACHE_ENTRY_BYTES', MAX_BYTES // 8))
+DISK_ENABLED = os.environ.get('PANEL_PDF_CACHE_DISK', '') not in ('', '0')
+DISK_MAX_ENTRIES = int(os.environ.get('PANEL_PDF_CACHE_DISK_ENTRIES', 1000))
+DISK_MAX_BYTES = int(os.environ.get('PANEL_PDF_CACHE_DISK_BYTES', 256 * 1024 * 1024))
+PDF_CACHE_DIR = os.path.join(CACHE_DIR, 'pdfs')
+
+_lock = threading.Lock()
+_cache = ByteLRU(MAX_BYTES, MAX_ENTRY_BYTES)
+_stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+
+def quote_key(customer_data, items_df, demo1=None, demo2=None) -> str:
+    """Return a hex digest identifying the PDF these inputs render to.
+
+    Uploads may be given as bytes, paths or file-like objects.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([KEY_VERSION, RENDER_DPI, JPEG_QUALITY, str(pricing.VAT_RATE), pricing.ROUNDING]).encode())
+    h.update(json.dumps(customer_data, sort_keys=True, default=str, ensure_ascii=False).encode())
+    h.update(json.dumps([str(c) for c in items_df.columns], ensure_ascii=False).encode())
+    h.update(pd.util.hash_pandas_object(items_df, index=False).to_numpy().tobytes())
+    for demo in (demo1, demo2):
+        h.update(b'-' if demo is None else content_digest(read_bytes(demo)).encode())
+    return h.hexdigest()
+
+
+def _disk_path(key, cache_dir):
+    return os.path.join(cache_dir, f'{key}.pdf')
+
+
+def _disk_get(key, cache_dir):
+    path = _disk_path(key, cache_dir)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    storage.touch(path)
+    return data
+
+
+def _disk_evict(cache_dir):
+    storage.evict(cache_dir, DISK_MAX_ENTRIES, DISK_MAX_BYTES)
+
+
+def _count(stat):
+    with _lock:
+        _stats[stat] += 1
+
+
+def _remember_file(key, path):
+    if os.path.getsize(path) <= MAX_ENTRY_BYTES:
+        with open(path, 'rb') as f:
+            _cache.put(key, f.read())
+
+
+def get(key, disk=None, cache_dir=PDF_CACHE_DIR):
+    """Return the cached PDF bytes for `key`, or None"""
+    data = _cache.get(key)
+    if data is not None:
+        _count('hits')
+        return data
+    if DISK_ENABLED if disk is None else disk:
+        data = _disk_get(key, cache_dir)
+        if data is not None:
+            _cache.put(key, data)
+            _count('disk_hits')
+            return data
+    _count('misses')
+    return None
+
+
+def put(key, data, disk=None, cache_dir=PDF_CACHE_DIR):
+    _cache.put(key, data)
+    if DISK_ENABLED if disk is None else disk:
+        storage.write_atomic(_disk_path(key, cache_dir), data)
+        _disk_evict(cache_dir)
+
+
+def get_file(key, path, disk=None, cache_dir=PDF_CACHE_DIR) -> bool:
+    """Write the cached PDF for `key` to `path`; return False if it is not cached"""
+    data = _cache.get(key)
+    if data is not None:
+        with open(path, 'wb') as f:
+            f.write(data)
+        _count('hits')
+        return True
+    if DISK_ENABLED if disk is None else disk:
+        cached = _disk_path(key, cache_dir)
+        try:
+            shutil.copyfile(cached, path)
+        except OSError:
+            pass
+        else:
+            storage.touch(cached)
+            _remember_file(key, path)
+            _count('disk_hits')
+            return True
+    _count('misses')
+    return False
+
+
+def render(customer_data, items_df, demo1=None, demo2=None, progress=None, key=None) -> bytes:
+    """Return the quote PDF bytes, rendering only if they are not cached"""
+    demo1 = read_bytes(demo1) if demo1 is not None else None
+    demo2 = read_bytes(demo2) if demo2 is not None else None
+    if key is None:
+        key = quote_key(customer_data, items_df, demo1, demo2)
+    data = get(key)
+    if data is None:
+        data = create_enhanced_pdf(customer_data, items_df, demo1, demo2, progress=progress).getvalue()
+        put(key, data)
+    elif progress:
+        progress(1.0)
+    return data
+
+
+def cache_info() -> dict:
+    """Return hit/miss counters and the size of the in-memory cache"""
+    with _lock:
+        hits = _stats['hits'] + _stats['disk_hits']
+        calls = hits + _stats['misses']
+        return {
+            **_stats,
+            'entries': len(_cache),
+            'bytes': _cache.nbytes,
+            'max_bytes': MAX_BYTES,
+            'hit_rate': hits / calls if calls else 0.0,
+        }
+
+
+def cache_clear() -> None:
+    _cache.clear()
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
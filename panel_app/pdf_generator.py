@@ -1,56 +1,74 @@
 # file: panel_app/pdf_generator.py
 import io
-import os
 from datetime import date
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.utils import ImageReader
 from reportlab.lib.units import mm
-from PIL import Image as PILImage
 
-from utils.helpers import asset_path
-from utils.rtl import rtl
-
-
-def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
-    """Create styled PDF"""
+from . import perf, pricing
+from .utils.assets import asset_image, pdf_fonts
+from .utils.images import prepare_image
+from .utils.rtl import rtl, rtl_many
+from .utils.text_fit import fit_text
+
+LEGAL_TERMS = [
+    "הצעת המחיר תקפה ל-14 ימים ממועד הפקתה.",
+    "ההצעה מיועדת ללקוח הספציפי בלבד ולא להעברה לחוץ.",
+    "המחירים עשויים להשתנות והחברה אינה אחראית לטעויות.",
+    "אישור ההצעה מהווה התחייבות לתשלום 10% מקדמה.",
+    "הלקוח מתחייב לפנות נקודות מים וחשמל בהתאם לתכניות.",
+    "אי עמידה בתנאים עלולה לגרור עיכובים וחריגות."
+]
+
+# שורות הטבלה נעצרות מעל הפוטר
+TABLE_BOTTOM = 20 * mm
+# קו מפריד, רווח ותיבת הסיכום שאחרי הטבלה
+SUMMARY_HEIGHT = 15 * mm + 12 * mm + 35 * mm
+# טקסט משפטי וחתימה כשאין עמודי הדמיה
+TERMS_HEIGHT = 10 * mm + len(LEGAL_TERMS) * 5 * mm + 10 * mm
+SIGNATURE_BOTTOM = 25 * mm
+
+def paginate_rows(n_rows, first_page_rows, page_rows):
+    """Split the item rows into (start, stop) ranges, one per page"""
+    first_page_rows = max(first_page_rows, 0)
+    page_rows = max(page_rows, 1)
+    pages = [(0, min(n_rows, first_page_rows))]
+    start = pages[0][1]
+    while start < n_rows:
+        stop = min(n_rows, start + page_rows)
+        pages.append((start, stop))
+        start = stop
+    return pages
+
+
+@perf.timed('pdf.render')
+def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None, progress=None):
+    """Create styled PDF
+
+    `progress`, if given, is called with the finished fraction (0..1) after
+    every page and once more when the document is saved.
+    """
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
     W, H = A4
     m = 20 * mm
     ROW_HEIGHT = 8 * mm  # הגדלת גובה השורות
 
-    try:
-        reg_path = asset_path('Heebo-Regular.ttf')
-        bold_path = asset_path('Heebo-Bold.ttf')
-        pdfmetrics.registerFont(TTFont('Heebo', reg_path))
-        pdfmetrics.registerFont(TTFont('Heebo-Bold', bold_path))
-        PDF_FONT = 'Heebo'
-        PDF_BOLD = 'Heebo-Bold'
-    except Exception:
-        fallback = asset_path('Heebo-Regular.ttf')
-        if os.path.exists(fallback):
-            pdfmetrics.registerFont(TTFont('Hebrew', fallback))
-            PDF_FONT = PDF_BOLD = 'Hebrew'
-        else:
-            PDF_FONT = PDF_BOLD = 'Helvetica'
+    PDF_FONT, PDF_BOLD = pdf_fonts()
 
     def draw_rtl(canv, x, y, text, font=PDF_FONT, fontsize=12):
         canv.setFont(font, fontsize)
         canv.drawRightString(x, y, rtl(text))
 
-    def draw_watermark(canv):
-        wm_path = asset_path('watermark.png')
-        if os.path.exists(wm_path):
+    def draw_watermark_chrome(canv):
+        watermark = asset_image('watermark.png')
+        if watermark:
             canv.saveState()
             try:
                 canv.setFillAlpha(0.1)
             except Exception:
                 pass
-            img = ImageReader(wm_path)
-            w_img, h_img = img.getSize()
+            img, (w_img, h_img) = watermark
             scale = min((W / 2) / w_img, (H / 2) / h_img)
             nw, nh = w_img * scale, h_img * scale
             canv.translate(W / 2, H / 2)
@@ -58,17 +76,16 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
             canv.drawImage(img, -nw / 2, -nh / 2, width=nw, height=nh)
             canv.restoreState()
 
-    def draw_footer(canv, page, total):
+    def draw_footer_chrome(canv):
         # פס אדום בתחתית
         canv.setFillColorRGB(0.827, 0.184, 0.184)
         canv.rect(0, 0, W, 3 * mm, fill=1, stroke=0)
 
         # לוגו קטן משמאל - משתמש באותו קובץ לוגו
         x = m
-        logo_path = asset_path('logo.png')  # שימוש באותו קובץ לוגו
-        if os.path.exists(logo_path):
-            img = ImageReader(logo_path)
-            w, h = img.getSize()
+        logo = asset_image('logo.png')  # שימוש באותו קובץ לוגו
+        if logo:
+            img, (w, h) = logo
             scale = (8 * mm) / h  # הגדלת הלוגו בפוטר
             canv.drawImage(img, x, 4 * mm, height=8 * mm, width=w * scale, preserveAspectRatio=True, mask='auto')
             x += w * scale + 5 * mm
@@ -77,45 +94,64 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
         canv.setFont(PDF_FONT, 9)  # הגדלת פונט
         canv.setFillColorRGB(0, 0, 0)
         info = "הנגרים 1 (מתחם הורדוס), באר שבע | טל: 072-393-3997 | דוא\"ל: info@panel-k.co.il"
-        c.drawString(x, 7 * mm, rtl(info))
+        canv.drawString(x, 7 * mm, rtl(info))
 
-        # מספור עמודים מימין
-        page_text = rtl(f"עמוד {page} מתוך {total}")
-        canv.setFont(PDF_FONT, 9)
-        canv.drawRightString(W - m, 7 * mm, page_text)
+    logo_big = asset_image('logo.png')
+    logo_w = 70 * mm  # הגדלת הלוגו ל-70mm
+    logo_h = 0
+    if logo_big:
+        w_img, h_img = logo_big[1]
+        logo_h = h_img * logo_w / w_img
+    header_y = H - m - logo_h - 25 * mm
 
-    def draw_header(canv):
+    def draw_header_chrome(canv):
         # מסגרת מעוצבת לכל העמוד
         canv.setStrokeColorRGB(0.827, 0.184, 0.184)
         canv.setLineWidth(2)
         canv.rect(m / 2, m / 2, W - m, H - m, fill=0, stroke=1)
 
-        logo_big = asset_path('logo.png')
-        logo_w = 70 * mm  # הגדלת הלוגו ל-70mm
-        logo_h = 0
-        if os.path.exists(logo_big):
-            img = ImageReader(logo_big)
-            w_img, h_img = img.getSize()
-            ratio = logo_w / w_img
-            logo_h = h_img * ratio
+        if logo_big:
             # הלוגו קרוב יותר לפינה
-            canv.drawImage(img, m / 2 + 5 * mm, H - m / 2 - logo_h - 5 * mm, width=logo_w, height=logo_h,
+            canv.drawImage(logo_big[0], m / 2 + 5 * mm, H - m / 2 - logo_h - 5 * mm, width=logo_w, height=logo_h,
                            preserveAspectRatio=True, mask='auto')
         canv.setFont(PDF_BOLD, 42)  # הגדלת כותרת
         canv.setFillColorRGB(0.827, 0.184, 0.184)
         canv.drawCentredString(W / 2, H - m - logo_h - 15 * mm, rtl('הצעת מחיר'))
-        return H - m - logo_h - 25 * mm
 
-    pages_total = 1
-    if demo1 or demo2:
-        # כל תמונה בעמוד נפרד + עמוד לטקסט משפטי
-        pages_total += (1 if demo1 else 0) + (1 if demo2 else 0) + 1
+    # המסגרת, הכותרת, סימן המים והפוטר נשמרים פעם אחת כ-form ומשובצים בכל עמוד
+    c.beginForm('page_header')
+    draw_header_chrome(c)
+    c.endForm()
+    c.beginForm('page_watermark')
+    draw_watermark_chrome(c)
+    c.endForm()
+    c.beginForm('page_footer')
+    draw_footer_chrome(c)
+    c.endForm()
 
-    page_num = 1
+    def draw_watermark(canv):
+        canv.doForm('page_watermark')
 
-    y = draw_header(c)
-    draw_watermark(c)
-    c.setFillColorRGB(0, 0, 0)
+    def draw_footer(canv, page, total):
+        canv.doForm('page_footer')
+
+        # מספור עמודים מימין
+        page_text = rtl(f"עמוד {page} מתוך {total}")
+        canv.setFont(PDF_FONT, 9)
+        canv.setFillColorRGB(0, 0, 0)
+        canv.drawRightString(W - m, 7 * mm, page_text)
+        if progress:
+            # השמירה נחשבת כשלב נוסף אחרי העמוד האחרון
+            progress(page / (total + 1))
+
+    def draw_header(canv):
+        canv.doForm('page_header')
+        # מצב הציור שהכותרת משאירה אחריה
+        canv.setStrokeColorRGB(0.827, 0.184, 0.184)
+        canv.setLineWidth(2)
+        canv.setFont(PDF_BOLD, 42)
+        canv.setFillColorRGB(0.827, 0.184, 0.184)
+        return header_y
 
     customer_details = [
         ("📱 לכבוד:", customer_data['name']),
@@ -124,16 +160,48 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
         ("✉️ דוא\"ל:", customer_data['email']),
         ("📍 כתובת:", customer_data['address']),
     ]
+    records = items_df.to_dict(orient='records')
+
+    # פריסת הטבלה על פני עמודים לפני הציור, כדי שמספור העמודים יהיה נכון
+    table_top = header_y - len(customer_details) * 7 * mm - 8 * mm
+    pages = paginate_rows(
+        len(records),
+        int((table_top - ROW_HEIGHT - TABLE_BOTTOM) // ROW_HEIGHT),
+        int((header_y - ROW_HEIGHT - TABLE_BOTTOM) // ROW_HEIGHT),
+    )
+    last_top = table_top if len(pages) == 1 else header_y
+    last_start, last_stop = pages[-1]
+    table_end = last_top - ROW_HEIGHT * (1 + last_stop - last_start)
+    summary_on_new_page = table_end - SUMMARY_HEIGHT < TABLE_BOTTOM
+    summary_end = (header_y if summary_on_new_page else table_end) - SUMMARY_HEIGHT
+    terms_on_new_page = not (demo1 or demo2) and summary_end - TERMS_HEIGHT < SIGNATURE_BOTTOM
+
+    pages_total = len(pages) + summary_on_new_page + terms_on_new_page
+    if demo1 or demo2:
+        # כל תמונה בעמוד נפרד + עמוד לטקסט משפטי
+        pages_total += (1 if demo1 else 0) + (1 if demo2 else 0) + 1
+
+    page_num = 1
+
+    def new_page():
+        nonlocal page_num
+        draw_footer(c, page_num, pages_total)
+        c.showPage()
+        page_num += 1
+        y_top = draw_header(c)
+        draw_watermark(c)
+        c.setFillColorRGB(0, 0, 0)
+        return y_top
+
+    y = draw_header(c)
+    draw_watermark(c)
+    c.setFillColorRGB(0, 0, 0)
+
     for label, value in customer_details:
         draw_rtl(c, W - m, y, f"{label} {value}", font=PDF_FONT, fontsize=14)  # הגדלת פונט
         y -= 7 * mm
     y -= 8 * mm
 
-    # כותרות טבלה - מחדש עם מרווחים טובים יותר
-    c.setFont(PDF_BOLD, 12)
-    c.setFillColorRGB(0.827, 0.184, 0.184)
-    c.rect(m, y - ROW_HEIGHT, W - 2 * m, ROW_HEIGHT, fill=1, stroke=0)
-
     # הגדרת עמודות עם מרווחים נכונים
     col_widths = {
         'total': 40 * mm,
@@ -148,67 +216,75 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
     x_price = m + col_widths['total'] + col_widths['price'] - 3 * mm
     x_total = m + col_widths['total'] - 3 * mm
 
-    # ציור גבולות עמודות
-    c.setLineWidth(0.5)
-    c.setStrokeColorRGB(0.8, 0.8, 0.8)
-    c.rect(m, y - ROW_HEIGHT, W - 2 * m, ROW_HEIGHT, fill=0, stroke=1)
-
-    # כותרות
-    c.setFillColorRGB(1, 1, 1)
-    text_y = y - ROW_HEIGHT / 2 - 2
-    draw_rtl(c, x_product, text_y, "מוצר", PDF_BOLD, 12)
-    draw_rtl(c, x_qty + col_widths['qty'] - 5 * mm, text_y, "כמות", PDF_BOLD, 12)
-    draw_rtl(c, x_price + col_widths['price'] - 5 * mm, text_y, "מחיר ליחידה", PDF_BOLD, 12)
-    draw_rtl(c, x_total + col_widths['total'] - 5 * mm, text_y, "סה\"כ", PDF_BOLD, 12)
-
-    y -= ROW_HEIGHT
-    c.setFont(PDF_FONT, 11)  # הגדלת פונט בטבלה
-    c.setFillColorRGB(0, 0, 0)
-
-    for i, rec in enumerate(items_df.to_dict(orient='records')):
-        # רקע לשורות זוגיות
-        if i % 2 == 0:
-            c.setFillColorRGB(0.9, 0.9, 0.9)  # צבע כהה יותר
-            c.rect(m, y - ROW_HEIGHT, W - 2 * m, ROW_HEIGHT, fill=1, stroke=0)
+    def draw_table_header(y):
+        # כותרות טבלה - חוזרות בראש כל עמוד
+        c.setFont(PDF_BOLD, 12)
+        c.setFillColorRGB(0.827, 0.184, 0.184)
+        c.rect(m, y - ROW_HEIGHT, W - 2 * m, ROW_HEIGHT, fill=1, stroke=0)
 
-        # גבולות שורה
+        # ציור גבולות עמודות
         c.setLineWidth(0.5)
         c.setStrokeColorRGB(0.8, 0.8, 0.8)
         c.rect(m, y - ROW_HEIGHT, W - 2 * m, ROW_HEIGHT, fill=0, stroke=1)
 
-        # טקסט
-        c.setFillColorRGB(0, 0, 0)
+        # כותרות
+        c.setFillColorRGB(1, 1, 1)
         text_y = y - ROW_HEIGHT / 2 - 2
+        draw_rtl(c, x_product, text_y, "מוצר", PDF_BOLD, 12)
+        draw_rtl(c, x_qty + col_widths['qty'] - 5 * mm, text_y, "כמות", PDF_BOLD, 12)
+        draw_rtl(c, x_price + col_widths['price'] - 5 * mm, text_y, "מחיר ליחידה", PDF_BOLD, 12)
+        draw_rtl(c, x_total + col_widths['total'] - 5 * mm, text_y, "סה\"כ", PDF_BOLD, 12)
 
-        # מוצר - עם padding וחיתוך אם ארוך מדי
-        product_text = rec['הפריט']
-        c.saveState()
-        c.setFont(PDF_FONT, 11)
-        # הגבלת רוחב הטקסט של המוצר
-        max_width = col_widths['product'] - 10 * mm
-        text_width = c.stringWidth(rtl(product_text), PDF_FONT, 11)
-        if text_width > max_width:
-            # חיתוך טקסט ארוך מדי
-            while text_width > max_width and len(product_text) > 3:
-                product_text = product_text[:-1]
-                text_width = c.stringWidth(rtl(product_text + "..."), PDF_FONT, 11)
-            product_text += "..."
-        draw_rtl(c, x_product, text_y, product_text, PDF_FONT, 11)
-        c.restoreState()
-
-        # כמות - ממורכז בעמודה
-        qty_text = str(int(rec['כמות']))
-        c.drawCentredString(x_qty + col_widths['qty'] / 2, text_y, qty_text)
-
-        # מחיר - יישור לימין עם padding
-        price_text = f"₪{rec['מחיר יחידה']:,.2f}"
-        c.drawRightString(x_price + col_widths['price'] - 5 * mm, text_y, price_text)
-
-        # סה"כ - יישור לימין עם padding
-        total_text = f"₪{rec['סהכ']:,.2f}"
-        c.drawRightString(x_total + col_widths['total'] - 5 * mm, text_y, total_text)
-
-        y -= ROW_HEIGHT
+        c.setFont(PDF_FONT, 11)  # הגדלת פונט בטבלה
+        c.setFillColorRGB(0, 0, 0)
+        return y - ROW_HEIGHT
+
+    with perf.stage('pdf.table'):
+        for page_index, (start, stop) in enumerate(pages):
+            if page_index:
+                y = new_page()
+            y = draw_table_header(y)
+
+            for i in range(start, stop):
+                rec = records[i]
+                # רקע לשורות זוגיות
+                if i % 2 == 0:
+                    c.setFillColorRGB(0.9, 0.9, 0.9)  # צבע כהה יותר
+                    c.rect(m, y - ROW_HEIGHT, W - 2 * m, ROW_HEIGHT, fill=1, stroke=0)
+
+                # גבולות שורה
+                c.setLineWidth(0.5)
+                c.setStrokeColorRGB(0.8, 0.8, 0.8)
+                c.rect(m, y - ROW_HEIGHT, W - 2 * m, ROW_HEIGHT, fill=0, stroke=1)
+
+                # טקסט
+                c.setFillColorRGB(0, 0, 0)
+                text_y = y - ROW_HEIGHT / 2 - 2
+
+                # מוצר - עם padding וחיתוך אם ארוך מדי
+                c.saveState()
+                c.setFont(PDF_FONT, 11)
+                # הגבלת רוחב הטקסט של המוצר וחיתוך אם ארוך מדי
+                product_text = fit_text(rec['הפריט'], col_widths['product'] - 10 * mm, PDF_FONT, 11)
+                draw_rtl(c, x_product, text_y, product_text, PDF_FONT, 11)
+                c.restoreState()
+
+                # כמות - ממורכז בעמודה
+                qty_text = str(int(rec['כמות']))
+                c.drawCentredString(x_qty + col_widths['qty'] / 2, text_y, qty_text)
+
+                # מחיר - יישור לימין עם padding
+                price_text = f"₪{rec['מחיר יחידה']:,.2f}"
+                c.drawRightString(x_price + col_widths['price'] - 5 * mm, text_y, price_text)
+
+                # סה"כ - יישור לימין עם padding
+                total_text = f"₪{rec['סהכ']:,.2f}"
+                c.drawRightString(x_total + col_widths['total'] - 5 * mm, text_y, total_text)
+
+                y -= ROW_HEIGHT
+
+    if summary_on_new_page:
+        y = new_page()
 
     y -= 15 * mm
     c.setLineWidth(3)  # קו עבה יותר
@@ -217,12 +293,12 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
 
     y -= 12 * mm
     c.setFont(PDF_FONT, 14)  # הגדלת פונט לסיכום
-    subtotal = items_df['סהכ'].sum()
-    contractor_discount = float(customer_data.get('contractor_discount', 0))
-    sub_after = subtotal - contractor_discount
-    vat = sub_after * 0.17
-    discount_amount = (sub_after + vat) * (customer_data['discount'] / 100)
-    total = sub_after + vat - discount_amount
+    totals = pricing.quote_totals(items_df, customer_data)
+    contractor_discount = totals['contractor_discount']
+    sub_after = totals['net']
+    vat = totals['vat']
+    discount_amount = totals['discount']
+    total = totals['total']
 
     # תיבת סיכום עם רקע
     summary_box_height = 35 * mm
@@ -234,7 +310,7 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
         summary_lines.append((rtl("הנחת קבלן"), f"-₪{contractor_discount:,.2f}"))
     summary_lines.extend([
         (rtl("סכום ביניים"), f"₪{sub_after:,.2f}"),
-        (rtl('מע"מ (17%)'), f"₪{vat:,.2f}"),
+        (rtl(f'מע"מ ({pricing.vat_label()})'), f"₪{vat:,.2f}"),
         (rtl(f"הנחה ({customer_data['discount']}%)"), f"-₪{discount_amount:,.2f}")
     ])
 
@@ -274,12 +350,12 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
             c.drawCentredString(W / 2, y_img, rtl("הדמיה"))
             y_img -= 10 * mm
 
-            img1 = ImageReader(demo1)
-            w1, h1 = img1.getSize()
-
             # גודל מקסימלי עם שוליים מינימליים
             max_w = W - 20 * mm  # שוליים של 10mm מכל צד
             max_h = img_area_height
+            # הקטנה ודחיסה של ההדמיה לגודל המוצג
+            with perf.stage('pdf.images'):
+                img1, (w1, h1) = prepare_image(demo1, max_w, max_h)
             r1 = min(max_w / w1, max_h / h1)
             nw1, nh1 = w1 * r1, h1 * r1
             x1 = (W - nw1) / 2
@@ -306,12 +382,12 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
             c.drawCentredString(W / 2, y_img, rtl("הדמיית נקודות מים וחשמל"))
             y_img -= 10 * mm
 
-            img2 = ImageReader(demo2)
-            w2, h2 = img2.getSize()
-
             # גודל מקסימלי עם שוליים מינימליים
             max_w = W - 20 * mm
             max_h = img_area_height
+            # הקטנה ודחיסה של ההדמיה לגודל המוצג
+            with perf.stage('pdf.images'):
+                img2, (w2, h2) = prepare_image(demo2, max_w, max_h)
             r2 = min(max_w / w2, max_h / h2)
             nw2, nh2 = w2 * r2, h2 * r2
             x2 = (W - nw2) / 2
@@ -335,15 +411,8 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
         # טקסט משפטי - בצבע שחור
         c.setFont(PDF_FONT, 10)  # הגדלת הפונט
         c.setFillColorRGB(0, 0, 0)  # צבע שחור
-        for t in [
-            "הצעת המחיר תקפה ל-14 ימים ממועד הפקתה.",
-            "ההצעה מיועדת ללקוח הספציפי בלבד ולא להעברה לחוץ.",
-            "המחירים עשויים להשתנות והחברה אינה אחראית לטעויות.",
-            "אישור ההצעה מהווה התחייבות לתשלום 10% מקדמה.",
-            "הלקוח מתחייב לפנות נקודות מים וחשמל בהתאם לתכניות.",
-            "אי עמידה בתנאים עלולה לגרור עיכובים וחריגות."
-        ]:
-            draw_rtl(c, W - m, y, t, PDF_FONT, 10)
+        for t in rtl_many(LEGAL_TERMS):
+            c.drawRightString(W - m, y, t)
             y -= 5 * mm
         y -= 10 * mm
 
@@ -352,28 +421,29 @@ def create_enhanced_pdf(customer_data, items_df, demo1=None, demo2=None):
         draw_footer(c, page_num, pages_total)
         c.showPage()
     else:
+        if terms_on_new_page:
+            y = new_page()
+        else:
+            y -= summary_box_height  # מתחת לתיבת הסיכום
         y -= 10 * mm
         c.setFont(PDF_FONT, 10)  # הגדלת הפונט
         c.setFillColorRGB(0, 0, 0)  # צבע שחור
-        for t in [
-            "הצעת המחיר תקפה ל-14 ימים ממועד הפקתה.",
-            "ההצעה מיועדת ללקוח הספציפי בלבד ולא להעברה לחוץ.",
-            "המחירים עשויים להשתנות והחברה אינה אחראית לטעויות.",
-            "אישור ההצעה מהווה התחייבות לתשלום 10% מקדמה.",
-            "הלקוח מתחייב לפנות נקודות מים וחשמל בהתאם לתכניות.",
-            "אי עמידה בתנאים עלולה לגרור עיכובים וחריגות."
-        ]:
-            draw_rtl(c, W - m, y, t, PDF_FONT, 10)
+        for t in rtl_many(LEGAL_TERMS):
+            c.drawRightString(W - m, y, t)
             y -= 5 * mm
         y -= 10 * mm
-        if y < 40 * mm:
-            y = 40 * mm
+        if y < SIGNATURE_BOTTOM:
+            y = SIGNATURE_BOTTOM
         c.setFillColorRGB(0, 0, 0)
         draw_rtl(c, W - m, y, "חתימת הלקוח: __________", PDF_FONT, 14)
         draw_footer(c, page_num, pages_total)
         c.showPage()
         page_num += 1
 
-    c.save()
+    with perf.stage('pdf.write'):
+        c.save()
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    if progress:
+        progress(1.0)
+    return buffer
+
@@ -0,0 +1,199 @@
+# file: panel_app/pdf_jobs.py
+"""Generate quote PDFs on a background pool instead of the script thread.
+
+A Streamlit rerun that renders a long quote with two large renders blocks
+that session for seconds. `submit` snapshots the inputs, queues the render
+on a bounded thread pool and returns a job id straight away; the UI polls
+`get(job_id)` for progress and downloads the PDF once it is done.
+
+The pool size caps how many renders compete for the CPU at once, and
+submissions beyond PANEL_PDF_WORKERS + PANEL_PDF_QUEUE unfinished jobs are
+refused with `QueueFull`. Quotes already in `pdf_cache` are not queued at
+all; their job is returned finished. Finished jobs are kept for download
+until more than PANEL_PDF_RESULTS have accumulated, oldest first.
+
+A finished PDF is written once to a file in a per-process temporary
+directory (under PANEL_QUOTE_DIR if set) and the job keeps only its path;
+`pdf_cache` keeps it in memory only if it is small enough.
+The UI hands `read_result` to `st.download_button` as deferred data, so a
+rerun re-registers the job id rather than copying the PDF into Streamlit's
+media store; the file is read only when the button is clicked.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from . import pdf_cache, perf
+from .pdf_generator import create_enhanced_pdf
+from .utils.storage import read_bytes
+
+MAX_WORKERS = int(os.environ.get('PANEL_PDF_WORKERS', 2))
+MAX_QUEUED = int(os.environ.get('PANEL_PDF_QUEUE', 8))
+MAX_RESULTS = int(os.environ.get('PANEL_PDF_RESULTS', 32))
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+_lock = threading.Lock()
+_jobs = OrderedDict()
+_executor = None
+_result_dir = None
+
+
+class QueueFull(RuntimeError):
+    """Raised when too many quotes are already waiting to be rendered"""
+
+
+class Job:
+    __slots__ = ('id', 'status', 'progress', 'path', 'size', 'error', 'submitted', 'finished')
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = PENDING
+        self.progress = 0.0
+        self.path = None
+        self.size = 0
+        self.error = None
+        self.submitted = time.monotonic()
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.submitted
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='panel-pdf')
+    return _executor
+
+
+def _results():
+    global _result_dir
+    if _result_dir is None:
+        _result_dir = tempfile.mkdtemp(prefix='panel-quotes-', dir=os.environ.get('PANEL_QUOTE_DIR'))
+        atexit.register(shutil.rmtree, _result_dir, True)
+    return _result_dir
+
+
+def _remove(job):
+    if job.path:
+        try:
+            os.remove(job.path)
+        except FileNotFoundError:
+            pass
+
+
+def _trim():
+    finished = [job_id for job_id, job in _jobs.items() if job.done]
+    for job_id in finished[:max(0, len(finished) - MAX_RESULTS)]:
+        _remove(_jobs.pop(job_id))
+
+
+def _result_path(job):
+    return os.path.join(_results(), f'{job.id}.pdf')
+
+
+def _finish(job, path):
+    job.path = path
+    job.size = os.path.getsize(path)
+    job.progress = 1.0
+    job.status = DONE
+
+
+def _run(job, key, args):
+    job.status = RUNNING
+    perf.record('pdf.queue_wait', time.monotonic() - job.submitted)
+
+    def report(fraction):
+        job.progress = fraction
+
+    path = _result_path(job)
+    try:
+        result = create_enhanced_pdf(*args, progress=report).getvalue()
+        with open(path, 'wb') as f:
+            f.write(result)
+        _finish(job, path)
+        pdf_cache.put(key, result)
+    except Exception as e:
+        job.error = str(e)
+        job.status = FAILED
+        if job.path is None and os.path.exists(path):
+            os.remove(path)
+    finally:
+        job.finished = time.monotonic()
+        with _lock:
+            _trim()
+
+
+def submit(customer_data, items_df, demo1=None, demo2=None) -> str:
+    """Queue a quote for rendering and return its job id.
+
+    The inputs are copied (uploads are read into bytes) so later edits in
+    the session do not leak into a render that is already running.
+    """
+    args = (
+        dict(customer_data),
+        items_df.copy(),
+        read_bytes(demo1) if demo1 is not None else None,
+        read_bytes(demo2) if demo2 is not None else None,
+    )
+    key = pdf_cache.quote_key(*args)
+    job = Job(uuid.uuid4().hex)
+    path = _result_path(job)
+    if pdf_cache.get_file(key, path):
+        _finish(job, path)
+        job.finished = job.submitted
+        with _lock:
+            _jobs[job.id] = job
+            _trim()
+        return job.id
+    with _lock:
+        unfinished = sum(1 for j in _jobs.values() if not j.done)
+        if unfinished >= MAX_WORKERS + MAX_QUEUED:
+            raise QueueFull(f"{unfinished} quotes are already being rendered")
+        _jobs[job.id] = job
+    _pool().submit(_run, job, key, args)
+    return job.id
+
+
+def get(job_id):
+    """Return the job, or None if it is unknown or was dropped from the store"""
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def read_result(job_id) -> bytes:
+    """Return the PDF of a finished job; raises KeyError once it is gone"""
+    job = get(job_id)
+    if job is None or job.path is None:
+        raise KeyError(job_id)
+    with open(job.path, 'rb') as f:
+        return f.read()
+
+
+def discard(job_id):
+    with _lock:
+        job = _jobs.pop(job_id, None)
+    if job is not None:
+        _remove(job)
+
+
+def shutdown(wait=True):
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
@@ -0,0 +1,235 @@
+# file: panel_app/perf.py
+"""Lightweight per-stage timing for the catalog, dashboard and PDF pipeline.
+
+Wrap a stage in `with stage('pdf.write'):` or decorate a function with
+`@timed('catalog.load')`. Every run records its wall time and the change in
+allocated memory blocks, aggregated per stage name (count, total, max), and
+is logged as one JSON line on the `panel_app.perf` logger at DEBUG level.
+
+Exports:
+- `prometheus_text()` renders the aggregates in the Prometheus text format;
+  with PANEL_METRICS_FILE set it is also written to that file (atomically,
+  at most every PANEL_METRICS_INTERVAL seconds) for a textfile collector,
+  and `serve_metrics()` serves it on PANEL_METRICS_PORT.
+- PANEL_PROFILE=cprofile,tracemalloc turns on capture mode: the outermost
+  stage of each thread runs under cProfile (stats dumped to
+  CACHE_DIR/profiles) and/or records traced bytes and peak per stage.
+"""
+import cProfile
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from .utils.helpers import CACHE_DIR
+
+PROFILE_MODES = {m.strip() for m in os.environ.get('PANEL_PROFILE', '').split(',') if m.strip()}
+PROFILE_DIR = os.path.join(CACHE_DIR, 'profiles')
+METRICS_FILE = os.environ.get('PANEL_METRICS_FILE')
+METRICS_INTERVAL = float(os.environ.get('PANEL_METRICS_INTERVAL', 10))
+METRICS_PORT = int(os.environ.get('PANEL_METRICS_PORT', 0))
+
+logger = logging.getLogger('panel_app.perf')
+
+_lock = threading.Lock()
+_stats = {}
+_local = threading.local()
+_last_write = 0.0
+_server = None
+
+
+class StageStats:
+    __slots__ = ('count', 'seconds', 'max_seconds', 'blocks', 'traced_bytes', 'peak_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.blocks = 0
+        self.traced_bytes = 0
+        self.peak_bytes = 0
+
+
+def _record(name, seconds, blocks, traced, peak):
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = StageStats()
+        stats.count += 1
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        stats.blocks += blocks
+        stats.traced_bytes += traced
+        stats.peak_bytes = max(stats.peak_bytes, peak)
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as stage `name`"""
+    depth = getattr(_local, 'depth', 0)
+    _local.depth = depth + 1
+    profiler = None
+    if depth == 0 and 'cprofile' in PROFILE_MODES:
+        profiler = cProfile.Profile()
+    tracing = 'tracemalloc' in PROFILE_MODES
+    if tracing:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        traced_start = tracemalloc.get_traced_memory()[0]
+        if depth == 0:
+            tracemalloc.reset_peak()
+    blocks_start = sys.getallocatedblocks()
+    start = time.perf_counter()
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler is active (Python 3.12+ allows one per process)
+            profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        seconds = time.perf_counter() - start
+        blocks = sys.getallocatedblocks() - blocks_start
+        traced = peak = 0
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            traced = current - traced_start
+            peak -= traced_start
+        _local.depth = depth
+        _record(name, seconds, blocks, traced, peak)
+        if logger.isEnabledFor(logging.DEBUG):
+            event = {'stage': name, 'seconds': round(seconds, 6), 'blocks': blocks, 'depth': depth}
+            if tracing:
+                event.update(traced_bytes=traced, peak_bytes=peak)
+            logger.debug(json.dumps(event, ensure_ascii=False))
+        if profiler is not None:
+            _dump_profile(name, profiler)
+        if METRICS_FILE and depth == 0:
+            _maybe_write_metrics()
+
+
+def record(name, seconds):
+    """Record a duration measured elsewhere (e.g. time spent queued)"""
+    _record(name, seconds, 0, 0, 0)
+
+
+def timed(name):
+    """Decorator form of `stage`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _dump_profile(name, profiler):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f'{name}-{time.strftime("%Y%m%d-%H%M%S")}-{threading.get_ident()}.prof')
+    profiler.dump_stats(path)
+
+
+def snapshot() -> dict:
+    """Return the aggregates per stage as plain dicts"""
+    with _lock:
+        return {
+            name: {slot: getattr(stats, slot) for slot in StageStats.__slots__}
+            for name, stats in sorted(_stats.items())
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def _label(name):
+    return name.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text() -> str:
+    """Render the aggregates in the Prometheus text exposition format"""
+    metrics = [
+        ('panel_stage_seconds_total', 'counter', 'Total wall time spent in the stage', 'seconds'),
+        ('panel_stage_calls_total', 'counter', 'Number of completed runs of the stage', 'count'),
+        ('panel_stage_seconds_max', 'gauge', 'Longest single run of the stage', 'max_seconds'),
+        ('panel_stage_alloc_blocks_total', 'counter', 'Net memory blocks allocated by the stage', 'blocks'),
+    ]
+    if 'tracemalloc' in PROFILE_MODES:
+        metrics += [
+            ('panel_stage_traced_bytes_total', 'counter', 'Net bytes traced by tracemalloc', 'traced_bytes'),
+            ('panel_stage_peak_bytes', 'gauge', 'Highest traced peak above the start of the stage', 'peak_bytes'),
+        ]
+    stats = snapshot()
+    lines = []
+    for metric, kind, help_text, field in metrics:
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for name, values in stats.items():
+            lines.append(f'{metric}{{stage="{_label(name)}"}} {values[field]}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(path=None) -> None:
+    """Write `prometheus_text()` to `path` (default PANEL_METRICS_FILE) atomically"""
+    path = path or METRICS_FILE
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def _maybe_write_metrics():
+    global _last_write
+    now = time.monotonic()
+    with _lock:
+        if now - _last_write < METRICS_INTERVAL:
+            return
+        _last_write = now
+    try:
+        write_metrics()
+    except OSError:
+        logger.exception("could not write metrics to %s", METRICS_FILE)
+
+
+def serve_metrics(port=None):
+    """Serve `prometheus_text()` on http://0.0.0.0:<port>/metrics from a daemon thread.
+
+    Does nothing without a port (argument or PANEL_METRICS_PORT) or if the
+    server is already running in this process.
+    """
+    global _server
+    port = port or METRICS_PORT
+    if not port:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(('0.0.0.0', port), MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name='panel-metrics', daemon=True).start()
+    return _server
@@ -0,0 +1,149 @@
+# file: panel_app/pricing.py
+"""Quote pricing in integer agorot.
+
+The screen, the PDF and the batch generator all price through this module,
+so they cannot drift apart again. Amounts are converted to int64 agorot
+once, and every rate is applied as an exact integer ratio with an explicit
+rounding rule, so the result does not depend on float error or on the order
+lines are summed in. All functions work on whole arrays; pricing one order
+is the single-group case of `bulk_totals`.
+
+The order of operations matches the printed quote: line totals are summed,
+the contractor discount (a fixed amount) is taken off, VAT is added, and
+the percentage discount is applied to the amount including VAT.
+"""
+import os
+from decimal import Decimal
+
+import numpy as np
+
+from . import perf
+
+VAT_RATE = Decimal(os.environ.get('PANEL_VAT_RATE', '0.17'))
+HALF_UP = 'half_up'
+HALF_EVEN = 'half_even'
+ROUNDING = os.environ.get('PANEL_ROUNDING', HALF_UP)
+
+# percentages are carried as integers in units of 1/PERCENT_SCALE percent,
+# so discounts like 12.5% or 2.375% are applied exactly
+PERCENT_SCALE = 10000
+
+
+def _round_scaled(values, rounding):
+    if rounding == HALF_UP:
+        return np.sign(values) * np.floor(np.abs(values) + 0.5)
+    if rounding == HALF_EVEN:
+        return np.rint(values)
+    raise ValueError(f"unknown rounding rule: {rounding!r}")
+
+
+def to_agorot(amounts, rounding=ROUNDING):
+    """Convert shekel amounts (scalar or array-like) to int64 agorot"""
+    values = np.asarray(amounts, dtype=np.float64)
+    # clear float noise such as 1.005 * 100 == 100.49999999999999 before rounding
+    scaled = np.round(np.nan_to_num(values) * 100, 6)
+    return _round_scaled(scaled, rounding).astype(np.int64)
+
+
+def to_percent_units(percentages, rounding=ROUNDING):
+    """Convert percentages (5 means 5%) to int64 units of 1/PERCENT_SCALE percent"""
+    values = np.asarray(percentages, dtype=np.float64)
+    return _round_scaled(np.round(np.nan_to_num(values) * PERCENT_SCALE, 6), rounding).astype(np.int64)
+
+
+def apply_percent(agorot, percent_units, rounding=ROUNDING):
+    """Return `agorot * percent / 100` rounded to whole agorot"""
+    return divide(np.asarray(agorot, dtype=np.int64) * percent_units, 100 * PERCENT_SCALE, rounding)
+
+
+def to_shekels(agorot):
+    """Convert agorot back to shekels for display"""
+    return np.asarray(agorot, dtype=np.int64) / 100
+
+
+def divide(numerator, denominator, rounding=ROUNDING):
+    """Integer division of int64 arrays rounded to the nearest unit"""
+    numerator = np.asarray(numerator, dtype=np.int64)
+    quotient, remainder = np.divmod(np.abs(numerator), denominator)
+    twice = 2 * remainder
+    if rounding == HALF_UP:
+        quotient += twice >= denominator
+    elif rounding == HALF_EVEN:
+        quotient += (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    else:
+        raise ValueError(f"unknown rounding rule: {rounding!r}")
+    return np.sign(numerator) * quotient
+
+
+def apply_rate(agorot, rate, rounding=ROUNDING):
+    """Return `agorot * rate` rounded to whole agorot; `rate` is a Decimal or str"""
+    numerator, denominator = Decimal(rate).as_integer_ratio()
+    return divide(np.asarray(agorot, dtype=np.int64) * numerator, denominator, rounding)
+
+
+def line_totals(unit_prices, quantities, discount_pct=None, rounding=ROUNDING):
+    """Return the total of each line in agorot, after its own discount if given"""
+    gross = to_agorot(unit_prices, rounding) * np.asarray(quantities, dtype=np.int64)
+    if discount_pct is None:
+        return gross
+    return gross - apply_percent(gross, to_percent_units(discount_pct, rounding), rounding)
+
+
+def bulk_totals(quote_ids, lines, discount_pct=0, contractor_discount=0,
+                vat_rate=VAT_RATE, rounding=ROUNDING):
+    """Price many quotes at once.
+
+    `quote_ids` numbers the quote (0..n-1) each entry of `lines` (line totals
+    in agorot) belongs to; `discount_pct` and `contractor_discount` (shekels)
+    are scalars or one value per quote. Returns a dict of int64 agorot arrays
+    indexed by quote: subtotal, contractor_discount, net, vat, discount, total.
+    """
+    quote_ids = np.asarray(quote_ids, dtype=np.intp)
+    lines = np.asarray(lines, dtype=np.int64)
+    n = int(quote_ids.max()) + 1 if len(quote_ids) else 0
+    n = max(n, np.size(discount_pct), np.size(contractor_discount))
+
+    subtotal = np.zeros(n, dtype=np.int64)
+    np.add.at(subtotal, quote_ids, lines)
+    contractor = np.broadcast_to(to_agorot(contractor_discount, rounding), (n,))
+    net = subtotal - contractor
+    vat = apply_rate(net, vat_rate, rounding)
+    discount = apply_percent(net + vat, to_percent_units(discount_pct, rounding), rounding)
+    return {
+        'subtotal': subtotal,
+        'contractor_discount': contractor.copy(),
+        'net': net,
+        'vat': vat,
+        'discount': discount,
+        'total': net + vat - discount,
+    }
+
+
+def order_totals(lines, discount_pct=0, contractor_discount=0, vat_rate=VAT_RATE, rounding=ROUNDING):
+    """Price one order from its line totals; return a dict of int agorot"""
+    lines = np.asarray(lines, dtype=np.int64)
+    totals = bulk_totals(np.zeros(len(lines), dtype=np.intp), lines,
+                         discount_pct, contractor_discount, vat_rate, rounding)
+    return {name: int(values[0]) for name, values in totals.items()}
+
+
+@perf.timed('pricing.quote')
+def quote_totals(items_df, customer_data, vat_rate=VAT_RATE, rounding=ROUNDING):
+    """Price the selected items (`מחיר יחידה`, `כמות`) with the customer's discounts.
+
+    Returns the dict of `order_totals` converted to shekels.
+    """
+    lines = line_totals(items_df['מחיר יחידה'].to_numpy(), items_df['כמות'].to_numpy(), rounding=rounding)
+    totals = order_totals(
+        lines,
+        customer_data.get('discount', 0) or 0,
+        customer_data.get('contractor_discount', 0) or 0,
+        vat_rate,
+        rounding,
+    )
+    return {name: value / 100 for name, value in totals.items()}
+
+
+def vat_label(vat_rate=VAT_RATE) -> str:
+    """Return the VAT rate as printed, e.g. '17%'"""
+    return f"{float(vat_rate * 100):g}%"
@@ -0,0 +1,243 @@
+# file: panel_app/quote_store.py
+"""Saved quotes in a local SQLite database.
+
+A quote is stored as one compact row: the customer fields, the item keys
+with their quantities and a snapshot of the name and unit price (in
+agorot) they were quoted at, and the content hashes of the renders. The
+renders themselves are stored once per hash in `images`. PDFs are not
+stored; `render_pdf` draws them again on demand through `pdf_cache`.
+
+The database runs in WAL mode so the Streamlit sessions and PDF workers can
+read while one of them writes; every thread gets its own connection.
+Searches by name or phone prefix and by date go through indexes, so they
+stay fast with hundreds of thousands of saved quotes.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime
+
+import pandas as pd
+
+from . import pdf_cache, pricing
+from .catalog_index import normalize
+from .utils.helpers import DATA_DIR
+from .utils.storage import content_digest, read_bytes
+
+DB_PATH = os.environ.get('PANEL_QUOTE_DB', os.path.join(DATA_DIR, 'quotes.sqlite3'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    quote_date TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    phone_key TEXT NOT NULL,
+    email TEXT NOT NULL,
+    address TEXT NOT NULL,
+    discount REAL NOT NULL,
+    contractor_discount REAL NOT NULL,
+    item_count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    items BLOB NOT NULL,
+    demo1 TEXT REFERENCES images(digest),
+    demo2 TEXT REFERENCES images(digest)
+);
+CREATE INDEX IF NOT EXISTS quotes_name ON quotes(name_key);
+CREATE INDEX IF NOT EXISTS quotes_phone ON quotes(phone_key);
+CREATE INDEX IF NOT EXISTS quotes_date ON quotes(quote_date);
+CREATE TABLE IF NOT EXISTS images (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+SUMMARY_COLUMNS = 'id, created_at, quote_date, name, phone, item_count, total'
+ITEM_COLUMNS = ['קטגוריה', 'הפריט', 'הערות']
+_DATE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+# sorts after every other character, so `key >= p AND key < p + _MAX` is a prefix match
+_MAX = '\U0010ffff'
+
+
+def _phone_key(phone):
+    return re.sub(r'\D', '', str(phone or ''))
+
+
+def _encode_items(items_df, prices, quantities):
+    payload = {'key': [str(k) for k in items_df.index], 'qty': quantities.tolist(), 'price': prices.tolist()}
+    for col in ITEM_COLUMNS:
+        values = items_df[col].tolist() if col in items_df.columns else [''] * len(items_df)
+        payload[col] = ['' if pd.isna(v) else str(v) for v in values]
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode())
+
+
+def _decode_items(blob):
+    payload = json.loads(zlib.decompress(blob))
+    prices = payload['price']
+    df = pd.DataFrame({col: payload[col] for col in ITEM_COLUMNS}, index=pd.Index(payload['key'], dtype=str))
+    df['מחיר יחידה'] = pricing.to_shekels(prices)
+    df['כמות'] = payload['qty']
+    df['סהכ'] = pricing.to_shekels(pricing.line_totals(df['מחיר יחידה'].to_numpy(), payload['qty']))
+    return df
+
+
+class QuoteStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    def _row(self, customer_data, items_df, demos, created_at):
+        quote_date = customer_data.get('date') or date.today()
+        prices = pricing.to_agorot(items_df['מחיר יחידה'].to_numpy())
+        quantities = items_df['כמות'].to_numpy(dtype='int64')
+        discount = float(customer_data.get('discount', 0) or 0)
+        contractor_discount = float(customer_data.get('contractor_discount', 0) or 0)
+        totals = pricing.order_totals(prices * quantities, discount, contractor_discount)
+        return (
+            created_at,
+            quote_date.isoformat() if hasattr(quote_date, 'isoformat') else str(quote_date),
+            customer_data.get('name', ''),
+            normalize(customer_data.get('name', '')).strip(),
+            customer_data.get('phone', ''),
+            _phone_key(customer_data.get('phone')),
+            customer_data.get('email', ''),
+            customer_data.get('address', ''),
+            discount,
+            contractor_discount,
+            len(items_df),
+            totals['total'],
+            _encode_items(items_df, prices, quantities),
+            *demos,
+        )
+
+    def _store_images(self, conn, demo1, demo2):
+        digests = []
+        for demo in (demo1, demo2):
+            if demo is None:
+                digests.append(None)
+                continue
+            data = read_bytes(demo)
+            digest = content_digest(data)
+            conn.execute('INSERT OR IGNORE INTO images (digest, data) VALUES (?, ?)', (digest, data))
+            digests.append(digest)
+        return digests
+
+    def save_many(self, quotes):
+        """Save (customer_data, items_df, demo1, demo2) tuples in one transaction; return their ids"""
+        conn = self._connection()
+        created_at = datetime.now().isoformat(timespec='seconds')
+        ids = []
+        with conn:
+            for customer_data, items_df, demo1, demo2 in quotes:
+                demos = self._store_images(conn, demo1, demo2)
+                cursor = conn.execute(
+                    'INSERT INTO quotes (created_at, quote_date, name, name_key, phone, phone_key, email, address, '
+                    'discount, contractor_discount, item_count, total, items, demo1, demo2) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    self._row(customer_data, items_df, demos, created_at),
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def save(self, customer_data, items_df, demo1=None, demo2=None) -> int:
+        """Save one quote and return its id"""
+        return self.save_many([(customer_data, items_df, demo1, demo2)])[0]
+
+    def _where(self, query):
+        query = (query or '').strip()
+        if not query:
+            return '', ()
+        if _DATE.match(query):
+            return 'WHERE quote_date = ?', (query,)
+        phone = _phone_key(query)
+        if phone and len(phone) >= len(re.sub(r'[\s\-+()]', '', query)):
+            return 'WHERE phone_key >= ? AND phone_key < ?', (phone, phone + _MAX)
+        name = normalize(query).strip()
+        return 'WHERE name_key >= ? AND name_key < ?', (name, name + _MAX)
+
+    def search(self, query='', page=1, page_size=20):
+        """Return (summaries of one page of matching quotes, newest first, total matches).
+
+        `query` is a name prefix, a phone number prefix or a YYYY-MM-DD date.
+        """
+        where, params = self._where(query)
+        conn = self._connection()
+        total = conn.execute(f'SELECT COUNT(*) FROM quotes {where}', params).fetchone()[0]
+        rows = conn.execute(
+            f'SELECT {SUMMARY_COLUMNS} FROM quotes {where} ORDER BY id DESC LIMIT ? OFFSET ?',
+            (*params, page_size, (page - 1) * page_size),
+        ).fetchall()
+        quotes = [dict(row) for row in rows]
+        for quote in quotes:
+            quote['total'] = quote['total'] / 100
+        return quotes, total
+
+    def _image(self, conn, digest):
+        if digest is None:
+            return None
+        row = conn.execute('SELECT data FROM images WHERE digest = ?', (digest,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, quote_id):
+        """Return the saved quote as a dict of customer_data, items (DataFrame), demo1 and demo2, or None"""
+        conn = self._connection()
+        row = conn.execute('SELECT * FROM quotes WHERE id = ?', (quote_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row['id'],
+            'created_at': row['created_at'],
+            'customer_data': {
+                'name': row['name'],
+                'phone': row['phone'],
+                'email': row['email'],
+                'address': row['address'],
+                'date': date.fromisoformat(row['quote_date']),
+                'discount': row['discount'],
+                'contractor': bool(row['contractor_discount']),
+                'contractor_discount': row['contractor_discount'],
+            },
+            'items': _decode_items(row['items']),
+            'demo1': self._image(conn, row['demo1']),
+            'demo2': self._image(conn, row['demo2']),
+        }
+
+    def render_pdf(self, quote_id) -> bytes:
+        """Render the PDF of a saved quote (served from `pdf_cache` when it was rendered before)"""
+        quote = self.get(quote_id)
+        if quote is None:
+            raise KeyError(quote_id)
+        return pdf_cache.render(quote['customer_data'], quote['items'], quote['demo1'], quote['demo2'])
+
+    def delete(self, quote_id):
+        """Delete a quote and the renders no other quote uses"""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM quotes WHERE id = ?', (quote_id,))
+            conn.execute(
+                'DELETE FROM images WHERE digest NOT IN '
+                '(SELECT demo1 FROM quotes WHERE demo1 IS NOT NULL '
+                'UNION SELECT demo2 FROM quotes WHERE demo2 IS NOT NULL)'
+            )
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM quotes').fetchone()[0]
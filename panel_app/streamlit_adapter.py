@@ -0,0 +1,45 @@
+# file: panel_app/streamlit_adapter.py
+"""Streamlit wrappers around the core modules.
+
+Only this module and the UI (`app`, `dashboard`) import Streamlit; parsing,
+pricing and PDF generation stay importable by workers, tests and batch
+jobs without paying for it.
+"""
+import streamlit as st
+
+from .catalog_index import CatalogIndex
+from .catalog_loader import load_catalog_file
+from .quote_store import QuoteStore
+
+
+@st.cache_resource(max_entries=8)
+def load_catalog(digest, _file, streaming=None):
+    """Parse an uploaded catalog once per file content.
+
+    Every session gets the same frame (not a copy per rerun as with
+    `st.cache_data`), so callers must treat it as read-only.
+    """
+    try:
+        return load_catalog_file(_file, streaming)
+    except Exception as e:
+        st.error(f"שגיאה בטעינת הקובץ: {str(e)}")
+        return None
+
+
+@st.cache_resource
+def get_quote_store():
+    """One store (and one connection per thread) for all sessions of the process"""
+    return QuoteStore()
+
+
+@st.cache_resource(max_entries=8)
+def get_catalog_index(digest, _catalog_df, _previous=None):
+    """Build the category/search index once per catalog file.
+
+    `_previous` is an optional (index, catalog, CatalogDiff) of an earlier
+    version of the same price list to update incrementally.
+    """
+    if _previous is not None:
+        index, old_df, diff = _previous
+        return index.updated(old_df, _catalog_df, diff)
+    return CatalogIndex(_catalog_df)
@@ -0,0 +1,76 @@
+# file: panel_app/utils/assets.py
+"""Process-wide registry of the static PDF assets.
+
+Fonts are registered with reportlab and images decoded the first time they
+are needed, then shared by every quote rendered in the process.
+"""
+import os
+import threading
+
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from .helpers import asset_path
+
+_lock = threading.Lock()
+_fonts = None
+_images = {}
+
+
+def _register_fonts():
+    try:
+        pdfmetrics.registerFont(TTFont('Heebo', asset_path('Heebo-Regular.ttf')))
+        pdfmetrics.registerFont(TTFont('Heebo-Bold', asset_path('Heebo-Bold.ttf')))
+        return 'Heebo', 'Heebo-Bold'
+    except Exception:
+        fallback = asset_path('Heebo-Regular.ttf')
+        if os.path.exists(fallback):
+            pdfmetrics.registerFont(TTFont('Hebrew', fallback))
+            return 'Hebrew', 'Hebrew'
+        return 'Helvetica', 'Helvetica'
+
+
+def pdf_fonts():
+    """Return the (regular, bold) font names, registering them on first use"""
+    global _fonts
+    if _fonts is None:
+        with _lock:
+            if _fonts is None:
+                _fonts = _register_fonts()
+    return _fonts
+
+
+def _decode_image(path):
+    img = ImageReader(path)
+    # ReportLab decodes an ImageReader (and builds its alpha mask) lazily on
+    # the first drawImage; do it here, under the lock, so the PDF pool
+    # threads only ever read the shared decoded data
+    img.getRGBData()
+    if img._dataA is not None:
+        img._dataA.getRGBData()
+    return img, img.getSize()
+
+
+def asset_image(filename):
+    """Return (ImageReader, (width, height)) for an asset image, or None if missing"""
+    try:
+        return _images[filename]
+    except KeyError:
+        pass
+    with _lock:
+        if filename not in _images:
+            path = asset_path(filename)
+            if os.path.exists(path):
+                _images[filename] = _decode_image(path)
+            else:
+                _images[filename] = None
+    return _images[filename]
+
+
+def reset():
+    """Forget all loaded assets (used by benchmarks to measure a cold start)"""
+    global _fonts
+    with _lock:
+        _fonts = None
+        _images.clear()
@@ -3,6 +3,8 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
+CACHE_DIR = os.environ.get('PANEL_CACHE_DIR', os.path.join(BASE_DIR, '.cache'))
+DATA_DIR = os.environ.get('PANEL_DATA_DIR', os.path.join(BASE_DIR, 'data'))
 
 
 def asset_path(filename: str) -> str:
@@ -0,0 +1,73 @@
+# file: panel_app/utils/images.py
+"""Prepare uploaded renders for embedding in the quote PDF.
+
+Phone and designer renders are often 12MP or more, far beyond what the
+drawn box needs. Each upload is oriented from its EXIF tag, downsampled to
+RENDER_DPI for the box it is drawn in and re-encoded as JPEG, which PDF
+embeds as-is. Results are cached by content hash and target size, so
+regenerating a quote does not process the same image again.
+"""
+import io
+import os
+
+from PIL import Image as PILImage
+from PIL import ImageOps
+from reportlab.lib.utils import ImageReader
+
+from .. import perf
+from .storage import ByteLRU, content_digest, read_bytes
+
+RENDER_DPI = int(os.environ.get('PANEL_RENDER_DPI', 150))
+JPEG_QUALITY = int(os.environ.get('PANEL_JPEG_QUALITY', 80))
+CACHE_MAX_BYTES = int(os.environ.get('PANEL_IMAGE_CACHE_BYTES', 64 * 1024 * 1024))
+
+# values are (jpeg, size); only the JPEG bytes count against the bound
+_cache = ByteLRU(CACHE_MAX_BYTES, size=lambda value: len(value[0]))
+
+
+@perf.timed('image.decode')
+def _process(data, max_px, quality):
+    with PILImage.open(io.BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(max_px, PILImage.LANCZOS)
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            img = img.convert('RGBA')
+            background = PILImage.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel('A'))
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+        out = io.BytesIO()
+        img.save(out, format='JPEG', quality=quality, optimize=True)
+        return out.getvalue(), img.size
+
+
+class PreparedImage(ImageReader):
+    """ImageReader over a prepared JPEG that never decodes it.
+
+    ReportLab names each drawn ImageReader by a hash of `getRGBData()`,
+    which decodes the whole image to raw RGB (megabytes per render) only to
+    embed the JPEG as-is afterwards. The cache key already identifies the
+    content, so it is returned as the signature instead.
+    """
+
+    def __init__(self, jpeg, signature):
+        super().__init__(io.BytesIO(jpeg))
+        self._signature = signature.encode()
+        # JPEG has no alpha channel for ReportLab to build a soft mask from
+        self._dataA = None
+
+    def getRGBData(self):
+        return self._signature
+
+
+def prepare_image(upload, box_width, box_height, dpi=RENDER_DPI, quality=JPEG_QUALITY):
+    """Return (ImageReader, (width, height)) of `upload` ready to draw in a box given in points"""
+    data = read_bytes(upload)
+    max_px = (max(1, round(box_width / 72 * dpi)), max(1, round(box_height / 72 * dpi)))
+    key = (content_digest(data), max_px, quality)
+    cached = _cache.get(key)
+    if cached is None:
+        cached = _cache.put(key, _process(data, max_px, quality))
+    jpeg, size = cached
+    return PreparedImage(jpeg, '%s-%dx%d-%d' % (key[0], *max_px, quality)), size
@@ -1,7 +1,12 @@
 # file: panel_app/utils/rtl.py
+from functools import lru_cache
+
 import arabic_reshaper
 from bidi.algorithm import get_display
 
+RTL_CACHE_SIZE = 4096
+
+
 def reverse_hebrew(text: str) -> str:
     """Reverse Hebrew text for proper display"""
     if isinstance(text, str):
@@ -9,12 +14,48 @@ def reverse_hebrew(text: str) -> str:
             return text[::-1]
     return text
 
-def rtl(text: str) -> str:
-    """Reshape and apply bidi algorithm"""
-    if not isinstance(text, str):
-        text = str(text)
+
+@lru_cache(maxsize=RTL_CACHE_SIZE)
+def _shape(text: str) -> str:
     try:
         reshaped = arabic_reshaper.reshape(text)
         return get_display(reshaped)
     except Exception:
         return text[::-1]
+
+
+def rtl(text: str) -> str:
+    """Reshape and apply bidi algorithm"""
+    if not isinstance(text, str):
+        text = str(text)
+    return _shape(text)
+
+
+def rtl_many(texts) -> list:
+    """Shape many strings in one call, shaping each distinct string once"""
+    shaped = {}
+    result = []
+    for text in texts:
+        if not isinstance(text, str):
+            text = str(text)
+        if text not in shaped:
+            shaped[text] = _shape(text)
+        result.append(shaped[text])
+    return result
+
+
+def rtl_cache_info() -> dict:
+    """Return hit/miss counters of the shaping cache"""
+    info = _shape.cache_info()
+    calls = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hit_rate': info.hits / calls if calls else 0.0,
+    }
+
+
+def rtl_cache_clear() -> None:
+    _shape.cache_clear()
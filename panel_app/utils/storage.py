@@ -0,0 +1,146 @@
+# file: panel_app/utils/storage.py
+"""Storage helpers shared by the caches.
+
+- `read_bytes` and `content_digest` turn an upload into bytes and the
+  SHA-256 every cache keys on.
+- `ByteLRU` is the thread-safe in-memory LRU bounded by the total size of
+  its values (prepared images, finished PDFs, uploaded renders).
+- `write_atomic` creates a file through a temporary file and a rename,
+  so readers in other processes never see a partial entry, and `evict`
+  keeps a cache directory within its bounds.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def read_bytes(upload) -> bytes:
+    """Return the content of an upload, a file-like object, bytes or a path"""
+    if isinstance(upload, (bytes, bytearray, memoryview)):
+        return bytes(upload)
+    if isinstance(upload, (str, os.PathLike)):
+        with open(upload, 'rb') as f:
+            return f.read()
+    if hasattr(upload, 'getvalue'):
+        return upload.getvalue()
+    upload.seek(0)
+    return upload.read()
+
+
+def content_digest(data: bytes) -> str:
+    """Return the SHA-256 hex digest of the contents"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ByteLRU:
+    """Least recently used cache bounded by the total size of its values.
+
+    `size(value)` gives the bytes a value holds (`len` by default). Values
+    larger than `max_entry_bytes` are not kept; otherwise the oldest
+    entries are dropped until the total is within `max_bytes`, always
+    keeping the newest one.
+    """
+
+    def __init__(self, max_bytes, max_entry_bytes=None, size=len):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes if max_entry_bytes is None else max_entry_bytes
+        self._size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the value for `key` (marking it recently used), or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store `value` unless `key` is already held; return the value held for `key`"""
+        size = self._size(value)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            if size > self.max_entry_bytes:
+                return value
+            self._entries[key] = value
+            self.nbytes += size
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self.nbytes -= self._size(old)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def replace_atomic(path, write):
+    """Create `path` by calling `write(tmp_path)` on a temporary file next to it, then renaming it"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        remove_file(tmp_path)
+        raise
+
+
+def write_atomic(path, data):
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+
+    replace_atomic(path, write)
+
+
+def touch(path):
+    """Mark a cache entry as recently used; ignore entries evicted meanwhile"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict(cache_dir, max_entries, max_bytes):
+    """Remove least recently used files until the directory is within bounds"""
+    entries = []
+    try:
+        it = os.scandir(cache_dir)
+    except FileNotFoundError:
+        return
+    with it:
+        for entry in it:
+            if entry.name.endswith('.tmp'):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    entries.sort(reverse=True)
+    total = 0
+    for count, (_, size, path) in enumerate(entries, start=1):
+        total += size
+        if count > max_entries or total > max_bytes:
+            remove_file(path)
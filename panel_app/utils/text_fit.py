@@ -0,0 +1,71 @@
+# file: panel_app/utils/text_fit.py
+"""Fit text into a column width using cached per-glyph widths.
+
+reportlab measures a string as the sum of its glyph widths, so the width of
+every prefix is a running sum and the cut point can be found by binary
+search instead of re-measuring the string once per removed character.
+Bidi reordering does not change the width, so logical text is measured.
+"""
+import bisect
+from itertools import accumulate
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+_glyph_widths = {}
+
+
+def glyph_width(char: str, font_name: str) -> float:
+    """Return the width of one character at font size 1"""
+    key = (font_name, char)
+    try:
+        return _glyph_widths[key]
+    except KeyError:
+        width = _glyph_widths[key] = stringWidth(char, font_name, 1000) / 1000
+        return width
+
+
+def text_width(text: str, font_name: str, font_size: float) -> float:
+    return sum(glyph_width(ch, font_name) for ch in text) * font_size
+
+
+def fit_text(text, max_width, font_name, font_size, ellipsis='...', min_chars=3, word_boundary=False):
+    """Return `text`, or its longest prefix plus `ellipsis` that fits `max_width`.
+
+    At least `min_chars` characters are kept. With `word_boundary` the cut is
+    moved back to the end of the last whole word when there is one.
+    """
+    text = str(text)
+    widths = list(accumulate(glyph_width(ch, font_name) * font_size for ch in text))
+    if not widths or widths[-1] <= max_width:
+        return text
+
+    budget = max_width - text_width(ellipsis, font_name, font_size)
+    cut = max(min_chars, min(bisect.bisect_right(widths, budget), len(text) - 1))
+    if word_boundary:
+        space = text.rfind(' ', 0, cut + 1)
+        if space >= min_chars:
+            cut = space
+    return text[:cut].rstrip() + ellipsis if word_boundary else text[:cut] + ellipsis
+
+
+def wrap_text(text, max_width, font_name, font_size, max_lines=2, ellipsis='...'):
+    """Split `text` into at most `max_lines` lines that fit `max_width`.
+
+    Lines break between words; the last line is truncated with `ellipsis`
+    when the text does not fit in `max_lines`.
+    """
+    words = str(text).split()
+    space = glyph_width(' ', font_name) * font_size
+    lines, start, current_width = [], 0, 0.0
+    for i, word in enumerate(words):
+        width = text_width(word, font_name, font_size)
+        if i > start and current_width + space + width > max_width:
+            if len(lines) == max_lines - 1:
+                break
+            lines.append(fit_text(' '.join(words[start:i]), max_width, font_name, font_size, ellipsis))
+            start, current_width = i, 0.0
+        current_width += (space if i > start else 0.0) + width
+    if start < len(words):
+        lines.append(fit_text(' '.join(words[start:]), max_width, font_name, font_size, ellipsis,
+                              word_boundary=True))
+    return lines
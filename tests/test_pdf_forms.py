@@ -0,0 +1,82 @@
+"""Check that drawing the page chrome from PDF forms renders like drawing it on every page."""
+import io
+import random
+from datetime import date
+
+import pandas as pd
+import pytest
+from reportlab.pdfgen import canvas
+
+from panel_app import pdf_generator
+
+pymupdf = pytest.importorskip('pymupdf')
+
+
+class InlineChromeCanvas(canvas.Canvas):
+    """Canvas that records the calls made inside a form and replays them at every doForm"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._forms = {}
+        self._recording = None
+
+    def beginForm(self, name, *args, **kwargs):
+        self._recording = self._forms[name] = []
+
+    def endForm(self, **kwargs):
+        self._recording = None
+
+    def doForm(self, name):
+        # drawn straight into the page, as before the forms, so any drawing
+        # state the chrome leaves behind carries over too
+        for method, args, kwargs in self._forms[name]:
+            getattr(canvas.Canvas, method)(self, *args, **kwargs)
+
+    def __getattribute__(self, attr):
+        value = super().__getattribute__(attr)
+        recording = super().__getattribute__('__dict__').get('_recording')
+        if recording is not None and callable(value) and not attr.startswith('_') and attr != 'endForm':
+            return lambda *args, **kwargs: recording.append((attr, args, kwargs))
+        return value
+
+
+def quote(n_items):
+    rnd = random.Random(n_items)
+    rows = []
+    for i in range(n_items):
+        qty, price = rnd.randint(1, 5), round(rnd.uniform(50, 5000), 2)
+        rows.append({'מספר': 1000 + i, 'הפריט': f'ארון מטבח {i} ' * rnd.randint(1, 4), 'הערות': '',
+                     'כמות': qty, 'מחיר יחידה': price, 'סהכ': qty * price, 'קטגוריה': 'ארונות'})
+    customer = {'name': 'ישראל ישראלי', 'phone': '050-1234567', 'email': 'name@example.com',
+                'address': 'הנגרים 1, באר שבע', 'date': date(2025, 1, 1), 'discount': 5.0,
+                'contractor': False, 'contractor_discount': 0.0}
+    return customer, pd.DataFrame(rows)
+
+
+def render_image():
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.radial_gradient('L').convert('RGB').resize((800, 600)).save(out, format='JPEG')
+    return out.getvalue()
+
+
+def page_pixels(pdf):
+    with pymupdf.open(stream=pdf, filetype='pdf') as doc:
+        return [page.get_pixmap(dpi=60).samples for page in doc]
+
+
+@pytest.mark.parametrize('n_items, with_render', [(3, False), (60, False), (300, False), (20, True)])
+def test_form_chrome_renders_like_inline_chrome(monkeypatch, n_items, with_render):
+    customer, items = quote(n_items)
+    demo = render_image() if with_render else None
+    with_forms = pdf_generator.create_enhanced_pdf(customer, items, demo).getvalue()
+    monkeypatch.setattr(canvas, 'Canvas', InlineChromeCanvas)
+    inline = pdf_generator.create_enhanced_pdf(customer, items, demo).getvalue()
+
+    assert b'/Subtype /Form' in with_forms and b'/Subtype /Form' not in inline
+    expected = page_pixels(inline)
+    actual = page_pixels(with_forms)
+    assert len(actual) == len(expected)
+    for page, (a, b) in enumerate(zip(actual, expected), start=1):
+        assert a == b, f'page {page} differs'
@@ -0,0 +1,135 @@
+"""Check the integer pricing against a Decimal reference of the printed quote."""
+import random
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from panel_app import pricing
+from panel_app.order_model import Order
+
+DECIMAL_ROUNDING = {pricing.HALF_UP: ROUND_HALF_UP, pricing.HALF_EVEN: ROUND_HALF_EVEN}
+
+
+def to_agorot(amount, rounding):
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), DECIMAL_ROUNDING[rounding]))
+
+
+def reference_totals(lines, discount_pct, contractor_discount, vat_rate, rounding):
+    """Price one order of (unit price, quantity) lines in Decimal, in agorot"""
+    mode = DECIMAL_ROUNDING[rounding]
+    subtotal = sum(to_agorot(price, rounding) * qty for price, qty in lines)
+    contractor = to_agorot(contractor_discount, rounding)
+    net = subtotal - contractor
+    vat = int((net * Decimal(vat_rate)).quantize(Decimal(1), mode))
+    discount = int(((net + vat) * Decimal(str(discount_pct)) / 100).quantize(Decimal(1), mode))
+    return {
+        'subtotal': subtotal,
+        'contractor_discount': contractor,
+        'net': net,
+        'vat': vat,
+        'discount': discount,
+        'total': net + vat - discount,
+    }
+
+
+def random_price(rnd):
+    # three decimals so that prices fall on half agorot too
+    return rnd.choice([0, 0.005, 1.005, 12.345, round(rnd.uniform(1, 5000), rnd.choice([2, 3]))])
+
+
+def random_order(rnd):
+    lines = [(random_price(rnd), rnd.randint(1, 12)) for _ in range(rnd.randint(1, 12))]
+    discount_pct = rnd.choice([0, 5, 10, 12.5, 2.375, round(rnd.uniform(0, 30), 3)])
+    # a contractor discount larger than the subtotal makes the net negative
+    contractor_discount = rnd.choice([0, 0, 100, round(rnd.uniform(0, 20000), 2)])
+    return lines, discount_pct, contractor_discount
+
+
+@pytest.mark.parametrize('rounding', [pricing.HALF_UP, pricing.HALF_EVEN])
+@pytest.mark.parametrize('vat_rate', ['0.17', '0.18'])
+def test_bulk_totals_match_decimal_reference(rounding, vat_rate):
+    rnd = random.Random(f'{rounding}-{vat_rate}')
+    orders = [random_order(rnd) for _ in range(6000)]
+
+    quote_ids, lines = [], []
+    for i, (order_lines, _, _) in enumerate(orders):
+        prices, quantities = zip(*order_lines)
+        quote_ids.extend([i] * len(order_lines))
+        lines.extend(pricing.line_totals(prices, quantities, rounding=rounding))
+    totals = pricing.bulk_totals(
+        quote_ids, lines,
+        [discount for _, discount, _ in orders],
+        [contractor for _, _, contractor in orders],
+        Decimal(vat_rate), rounding,
+    )
+
+    for i, (order_lines, discount, contractor) in enumerate(orders):
+        expected = reference_totals(order_lines, discount, contractor, vat_rate, rounding)
+        assert {name: int(values[i]) for name, values in totals.items()} == expected, order_lines
+
+
+@pytest.mark.parametrize('rounding', [pricing.HALF_UP, pricing.HALF_EVEN])
+def test_quote_totals_match_decimal_reference(rounding):
+    rnd = random.Random(rounding)
+    for _ in range(500):
+        lines, discount, contractor = random_order(rnd)
+        items = pd.DataFrame(lines, columns=['מחיר יחידה', 'כמות'])
+        customer = {'discount': discount, 'contractor_discount': contractor}
+        expected = reference_totals(lines, discount, contractor, pricing.VAT_RATE, rounding)
+        totals = pricing.quote_totals(items, customer, rounding=rounding)
+        assert totals == {name: value / 100 for name, value in expected.items()}
+
+
+def test_half_agora_rounding_rules():
+    assert pricing.to_agorot([0.005, 0.015, 1.005, -0.005], pricing.HALF_UP).tolist() == [1, 2, 101, -1]
+    assert pricing.to_agorot([0.005, 0.015, 1.005, -0.005], pricing.HALF_EVEN).tolist() == [0, 2, 100, 0]
+    assert pricing.divide(np.array([5, 15, -5]), 10, pricing.HALF_UP).tolist() == [1, 2, -1]
+    assert pricing.divide(np.array([5, 15, -5]), 10, pricing.HALF_EVEN).tolist() == [0, 2, 0]
+
+
+def catalog(rnd, n_items):
+    return pd.DataFrame(
+        {'הפריט': [f'פריט {i}' for i in range(n_items)],
+         'מחיר יחידה': [random_price(rnd) for _ in range(n_items)]},
+        index=pd.Index([str(1000 + i) for i in range(n_items)]),
+    )
+
+
+def assert_order_matches(order, catalog_df, customer):
+    totals = pricing.quote_totals(order.items_frame(catalog_df), customer)
+    assert order.totals(customer['discount'], customer['contractor_discount']) == totals
+
+
+def test_items_frame_uses_order_prices():
+    rnd = random.Random(1)
+    catalog_df = catalog(rnd, 20)
+    order = Order()
+    order.set_quantity('1003', 2, 100.0)  # e.g. a saved quote opened against a newer catalog
+    order.set_quantity('1007', 1, catalog_df.at['1007', 'מחיר יחידה'])
+    items = order.items_frame(catalog_df)
+    assert items['מחיר יחידה'].tolist() == [100.0, catalog_df.at['1007', 'מחיר יחידה']]
+    assert items.at['1003', 'סהכ'] == 200.0
+    assert_order_matches(order, catalog_df, {'discount': 5, 'contractor_discount': 0})
+
+
+def test_order_incremental_subtotal_matches_quote_totals():
+    rnd = random.Random(0)
+    catalog_df = catalog(rnd, 200)
+    order = Order()
+    for step in range(3000):
+        key = rnd.choice(catalog_df.index)
+        order.set_quantity(key, rnd.choice([0, 0, 1, 2, 3, 7]), catalog_df.at[key, 'מחיר יחידה'])
+        if step % 50 == 0:
+            customer = {'discount': rnd.choice([0, 5, 12.5]), 'contractor_discount': rnd.choice([0, 250.5])}
+            assert_order_matches(order, catalog_df, customer)
+
+    # move the order onto a catalog with new prices and without some items
+    new_df = catalog(rnd, 200).iloc[20:]
+    before, generation = set(order.quantities), order.generation
+    dropped, repriced = order.reprice(new_df)
+    assert set(dropped) == before - set(new_df.index)
+    assert set(order.quantities) == before & set(new_df.index)
+    assert order.generation == generation + 1
+    assert_order_matches(order, new_df, {'discount': 10, 'contractor_discount': 0})
@@ -0,0 +1,41 @@
+"""Check fit_text against the truncation loop create_enhanced_pdf used before it."""
+import random
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from panel_app.utils.assets import pdf_fonts
+from panel_app.utils.rtl import rtl
+from panel_app.utils.text_fit import fit_text, text_width, wrap_text
+
+WORDS = ['ארון', 'מגירה', 'דלת', 'משטח', 'קוורץ', 'פורמייקה', 'ידית', 'ציר', 'מדף',
+         'כיור', 'ברז', 'תאורה', 'לבן', 'אגוז', 'MDF', '60', 'ס"מ', '(2)', 'Blum']
+
+
+def legacy_fit(product_text, max_width, font, size):
+    text_width = stringWidth(rtl(product_text), font, size)
+    if text_width > max_width:
+        while text_width > max_width and len(product_text) > 3:
+            product_text = product_text[:-1]
+            text_width = stringWidth(rtl(product_text + "..."), font, size)
+        product_text += "..."
+    return product_text
+
+
+def test_fit_text_matches_legacy_loop():
+    font = pdf_fonts()[0]
+    rnd = random.Random(0)
+    for _ in range(3000):
+        name = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 14)))
+        max_width = rnd.uniform(5, 250)
+        assert fit_text(name, max_width, font, 11) == legacy_fit(name, max_width, font, 11), (name, max_width)
+
+
+def test_wrap_text_lines_fit():
+    font = pdf_fonts()[0]
+    rnd = random.Random(1)
+    for _ in range(500):
+        name = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 20)))
+        max_width = rnd.uniform(60, 250)
+        lines = wrap_text(name, max_width, font, 11)
+        assert 1 <= len(lines) <= 2
+        assert all(text_width(line, font, 11) <= max_width or len(line) <= 6 for line in lines), lines